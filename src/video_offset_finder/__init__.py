@@ -21,11 +21,17 @@ from importlib.metadata import version
 from .finder import find_offset
 from .hashing import (
     compute_hash,
+    compute_hashes_batch,
     compute_sad_signature,
     compute_video_signatures,
+    compute_video_signatures_multires,
     cross_correlate_signatures,
+    hamming_distance,
+    hamming_distances,
+    resample_signatures,
+    slice_signatures,
 )
-from .models import CompareType, OffsetResult, VideoInfo
+from .models import CompareType, OffsetResult, SignatureBundle, VideoInfo
 from .video import extract_frames, get_video_info
 
 __version__ = version("video-offset-finder")
@@ -36,15 +42,22 @@ __all__ = [
     # Models
     "CompareType",
     "OffsetResult",
+    "SignatureBundle",
     "VideoInfo",
     # Video utilities
     "get_video_info",
     "extract_frames",
     # Comparison utilities
     "compute_hash",
+    "compute_hashes_batch",
     "compute_sad_signature",
     "compute_video_signatures",
+    "compute_video_signatures_multires",
     "cross_correlate_signatures",
+    "hamming_distance",
+    "hamming_distances",
+    "resample_signatures",
+    "slice_signatures",
     # Version
     "__version__",
 ]
@@ -6,6 +6,7 @@ import logging
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from . import __version__
 from .finder import find_offset
@@ -96,10 +97,14 @@ approximate offset, then refines at higher FPS.
     return parser
 
 
-def main() -> None:
-    """Main entry point for the CLI."""
+def main(argv: Optional[list[str]] = None) -> None:
+    """Main entry point for the CLI.
+
+    Args:
+        argv: Command-line arguments, defaults to sys.argv[1:]
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.quiet:
         logging.disable(logging.CRITICAL)
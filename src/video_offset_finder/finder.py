@@ -1,13 +1,51 @@
 """Main offset finding algorithm using hierarchical search."""
 
+import functools
 import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-
-from .hashing import compute_video_signatures, cross_correlate_signatures
-from .models import CompareType, OffsetResult
+from typing import Callable, Optional, TypeVar
+
+from .hashing import (
+    compute_video_signatures,
+    compute_video_signatures_multires,
+    cross_correlate_signatures,
+    resample_signatures,
+    signature_width,
+    slice_signatures,
+)
+from .models import CompareType, OffsetResult, SignatureBundle
 from .video import get_video_info
 
+T = TypeVar("T")
+
+# Reference and distorted signatures are computed concurrently on multi-core
+# machines
+PAIR_WORKERS = min(2, os.cpu_count() or 1)
+
+# Videos whose coarse search range is at most this many times longer than
+# their fine search window are decoded once at native FPS for all phases,
+# instead of decoding the windows again
+SINGLE_PASS_MAX_RATIO = 2.0
+
+# Compare types cheap enough to compute for every native frame when one decode
+# serves several search phases. Wavelet hashes and SAD thumbnails cost more
+# per frame than decoding saves, so they are computed per phase instead.
+NATIVE_REUSE_TYPES = (CompareType.PHASH, CompareType.DHASH, CompareType.AHASH)
+
+# The frame-accurate search covers this many steps of the previous phase on
+# either side of its result, so an estimate off by a few sampled frames is
+# still corrected (0.5s at the default fine FPS of 10). The window never
+# exceeds refine_window, which also bounds it when phase 2 is skipped.
+FRAME_WINDOW_STEPS = 5
+
+# Offsets where less than this share of the shorter window overlaps are not
+# searched: on static or repeating content, a handful of frames at the edge
+# can match better than the true offset
+MIN_OVERLAP_RATIO = 0.5
+
 
 def format_timestamp(seconds: float) -> str:
     """Convert seconds to HH:MM:SS.ms format."""
@@ -19,6 +57,223 @@ def format_timestamp(seconds: float) -> str:
     return f"{hrs:02}:{mins:02}:{secs:02}.{millis:03}"
 
 
+def _offset_window(
+    expected_seconds: float, window_seconds: float, fps: float
+) -> tuple[int, int]:
+    """Convert an expected offset and search window from seconds to frames."""
+    return round(expected_seconds * fps), math.ceil(window_seconds * fps)
+
+
+def _min_overlap(ref_sigs: SignatureBundle, dist_sigs: SignatureBundle) -> int:
+    """Fewest overlapping frames an offset between two windows needs."""
+    return math.ceil(MIN_OVERLAP_RATIO * min(len(ref_sigs), len(dist_sigs)))
+
+
+def _correlate_windows(
+    ref_sigs: SignatureBundle,
+    dist_sigs: SignatureBundle,
+    compare_type: CompareType,
+    fps: float,
+    ref_start: float,
+    dist_start: float,
+    min_offset: Optional[int] = None,
+    max_offset: Optional[int] = None,
+) -> tuple[float, float]:
+    """Cross-correlate two windows and return the offset in seconds and distance."""
+    offset_frames, distance = cross_correlate_signatures(
+        ref_sigs,
+        dist_sigs,
+        compare_type,
+        min_offset=min_offset,
+        max_offset=max_offset,
+        min_overlap=_min_overlap(ref_sigs, dist_sigs),
+    )
+    # Account for both start positions when calculating the offset
+    return offset_frames / fps + ref_start - dist_start, distance
+
+
+def _check_ref_signatures(
+    bundle: SignatureBundle,
+    compare_type: CompareType,
+    hash_size: int,
+    fps: float,
+    start_offset: float,
+) -> None:
+    """Raise ValueError if precomputed signatures don't fit the coarse search."""
+    width = signature_width(compare_type, hash_size)
+    if bundle.signatures.shape[1] != width:
+        raise ValueError(
+            f"Reference signatures have {bundle.signatures.shape[1]} values per "
+            f"frame, but {compare_type.value} with hash size {hash_size} has {width}"
+        )
+
+    sampled_fps = bundle.fps
+    rel_tol = 1e-9
+    span = float(bundle.timestamps[-1] - bundle.timestamps[0]) if len(bundle) else 0.0
+    if sampled_fps is None and span > 0:
+        # Without a stored rate, estimate it from the timestamp spacing, which
+        # is only accurate to about one source frame
+        sampled_fps = (len(bundle) - 1) / span
+        rel_tol = 0.1
+    if sampled_fps is not None and not math.isclose(sampled_fps, fps, rel_tol=rel_tol):
+        raise ValueError(
+            f"Reference signatures were sampled at {sampled_fps:.2f} fps, but "
+            f"the coarse search samples at {fps:.2f} fps"
+        )
+
+    if len(bundle) and bundle.timestamps[0] >= start_offset + 1 / fps:
+        raise ValueError(
+            f"Reference signatures start at {bundle.timestamps[0]:.2f}s, after "
+            f"the start offset of {start_offset:.2f}s"
+        )
+
+
+def _run_pair(ref_task: Callable[..., T], dist_task: Callable[..., T]) -> tuple[T, T]:
+    """
+    Run the reference and distorted video computations concurrently.
+
+    Both tasks take a threads argument, which splits the cores between them
+    while they run at the same time.
+    """
+    if PAIR_WORKERS < 2:
+        return ref_task(), dist_task()
+
+    # Decoding runs in FFmpeg threads and releases the GIL, so two threads
+    # are enough to overlap both videos without pickling the results
+    threads = max(1, (os.cpu_count() or 1) // PAIR_WORKERS)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        dist_future = pool.submit(dist_task, threads=threads)
+        return ref_task(threads=threads), dist_future.result()
+
+
+def _slice_cache(
+    cache: Optional[tuple[float, float, SignatureBundle]],
+    start_time: float,
+    max_duration: float,
+) -> Optional[SignatureBundle]:
+    """Slice signatures out of cache if it covers the window, else return None."""
+    if cache is None:
+        return None
+    cache_start, cache_duration, bundle = cache
+    if cache_start <= start_time and start_time + max_duration <= (
+        cache_start + cache_duration
+    ):
+        return slice_signatures(bundle, start_time, max_duration)
+    return None
+
+
+def _window_signatures(
+    cache: Optional[tuple[float, float, SignatureBundle]],
+    path: Path,
+    fps: float,
+    compare_type: CompareType,
+    hash_size: int,
+    start_time: float,
+    max_duration: float,
+    desc: str,
+    quiet: bool,
+    threads: Optional[int] = None,
+) -> SignatureBundle:
+    """Slice signatures out of cache if it covers the window, else compute them."""
+    cached = _slice_cache(cache, start_time, max_duration)
+    if cached is not None:
+        return cached
+
+    return compute_video_signatures(
+        path,
+        fps,
+        compare_type,
+        hash_size,
+        start_time=start_time,
+        max_duration=max_duration,
+        desc=desc,
+        quiet=quiet,
+        threads=threads,
+    )
+
+
+def _window_signatures_multires(
+    cache: Optional[tuple[float, float, SignatureBundle]],
+    path: Path,
+    fps_list: list[float],
+    compare_type: CompareType,
+    hash_size: int,
+    start_time: float,
+    max_duration: float,
+    desc: str,
+    quiet: bool,
+    threads: Optional[int] = None,
+) -> dict[float, SignatureBundle]:
+    """
+    Like _window_signatures, for several frame rates at once.
+
+    The cache must hold signatures at the highest rate in fps_list.
+    """
+    cached = _slice_cache(cache, start_time, max_duration)
+    if cached is not None:
+        decoded_fps = min(get_video_info(path).fps, max(fps_list))
+        return resample_signatures(cached, decoded_fps, fps_list)
+
+    return compute_video_signatures_multires(
+        path,
+        fps_list,
+        compare_type,
+        hash_size,
+        start_time=start_time,
+        max_duration=max_duration,
+        desc=desc,
+        quiet=quiet,
+        threads=threads,
+    )
+
+
+def _range_signatures(
+    path: Path,
+    fps: float,
+    native_fps: Optional[float],
+    compare_type: CompareType,
+    hash_size: int,
+    start_time: float,
+    max_duration: Optional[float],
+    desc: str,
+    quiet: bool,
+    threads: Optional[int] = None,
+) -> tuple[SignatureBundle, Optional[tuple[float, float, SignatureBundle]]]:
+    """
+    Compute signatures at fps, and keep native FPS ones if native_fps is given.
+
+    Returns:
+        Tuple of (signatures at fps, native FPS cache or None)
+    """
+    if native_fps is None:
+        bundle = compute_video_signatures(
+            path,
+            fps,
+            compare_type,
+            hash_size,
+            start_time=start_time,
+            max_duration=max_duration,
+            desc=desc,
+            quiet=quiet,
+            threads=threads,
+        )
+        return bundle, None
+
+    multires = compute_video_signatures_multires(
+        path,
+        [fps, native_fps],
+        compare_type,
+        hash_size,
+        start_time=start_time,
+        max_duration=max_duration,
+        desc=desc,
+        quiet=quiet,
+        threads=threads,
+    )
+    cache = (start_time, max_duration or math.inf, multires[native_fps])
+    return multires[fps], cache
+
+
 def find_offset(
     ref_path: Path,
     dist_path: Path,
@@ -32,6 +287,7 @@ def find_offset(
     refine_window: float = 2.0,
     frame_accurate: bool = True,
     quiet: bool = False,
+    ref_signatures: Optional[SignatureBundle] = None,
 ) -> OffsetResult:
     """
     Find video offset using hierarchical coarse-to-fine search.
@@ -51,6 +307,11 @@ def find_offset(
         refine_window: Window size (seconds) around coarse result for refinement
         frame_accurate: If True, do final pass at native FPS for exact frame matching
         quiet: If True, suppress progress bars
+        ref_signatures: Precomputed coarse reference signatures, as returned by
+            compute_video_signatures(ref_path, coarse_fps, compare_type,
+            hash_size, start_time=start_offset). Skips decoding the reference
+            in the coarse phase. A ValueError is raised if their width, frame
+            rate or start time don't match these settings.
 
     Returns:
         OffsetResult with detected offset
@@ -84,32 +345,92 @@ def find_offset(
             ref_info.duration,
         )
 
-    ref_sigs = compute_video_signatures(
-        ref_path,
-        coarse_fps,
-        compare_type,
-        hash_size,
-        start_time=start_offset,
-        max_duration=ref_max_duration,
-        desc="Reference (coarse)",
-        quiet=quiet,
+    dist_search_duration = max_search_offset if max_search_offset else None
+
+    # Fine search windows (see phase 2), the video the match starts later in
+    # gets the longer one
+    fine_duration = min(refine_window * 2, max_duration or dist_info.duration)
+    long_fine_duration = fine_duration + refine_window
+
+    # Short videos are decoded once at native FPS: the coarse and fine
+    # signatures are subsampled from it, and later phases slice their windows
+    # out of it instead of decoding again
+    single_pass = (
+        frame_accurate
+        and compare_type in NATIVE_REUSE_TYPES
+        and native_fps > fine_fps > coarse_fps
+    )
+    ref_range = ref_max_duration or ref_info.duration - start_offset
+    dist_range = dist_search_duration or dist_info.duration
+    ref_single_pass = (
+        single_pass
+        and ref_signatures is None
+        and ref_range <= SINGLE_PASS_MAX_RATIO * long_fine_duration
+    )
+    dist_single_pass = (
+        single_pass and dist_range <= SINGLE_PASS_MAX_RATIO * long_fine_duration
     )
 
-    # Compute distorted video signatures
-    dist_search_duration = max_search_offset if max_search_offset else None
-    dist_sigs = compute_video_signatures(
+    # Compute distorted video signatures alongside
+    compute_dist = functools.partial(
+        _range_signatures,
         dist_path,
         coarse_fps,
+        native_fps if dist_single_pass else None,
         compare_type,
         hash_size,
+        start_time=0,
         max_duration=dist_search_duration,
         desc="Distorted (coarse)",
         quiet=quiet,
     )
+    # Comparing a file against itself over the same range needs only one decode
+    same_source = (
+        Path(ref_path).resolve() == Path(dist_path).resolve()
+        and start_offset == 0
+        and ref_max_duration == dist_search_duration
+        and ref_single_pass == dist_single_pass
+    )
+
+    ref_range_cache: Optional[tuple[float, float, SignatureBundle]] = None
+    if ref_signatures is not None:
+        _check_ref_signatures(
+            ref_signatures,
+            compare_type,
+            hash_size,
+            min(coarse_fps, ref_info.fps),
+            start_offset,
+        )
+        ref_sigs = slice_signatures(ref_signatures, start_offset, ref_max_duration)
+        dist_sigs, dist_range_cache = compute_dist()
+    elif same_source:
+        dist_sigs, dist_range_cache = compute_dist()
+        ref_sigs, ref_range_cache = dist_sigs, dist_range_cache
+    else:
+        (ref_sigs, ref_range_cache), (dist_sigs, dist_range_cache) = _run_pair(
+            functools.partial(
+                _range_signatures,
+                ref_path,
+                coarse_fps,
+                native_fps if ref_single_pass else None,
+                compare_type,
+                hash_size,
+                start_time=start_offset,
+                max_duration=ref_max_duration,
+                desc="Reference (coarse)",
+                quiet=quiet,
+            ),
+            compute_dist,
+        )
 
     # Find best offset via cross-correlation
+    # A distorted range cut at max_search_offset only partly overlaps the
+    # reference at negative offsets, so only whole videos get a minimum
     coarse_offset_frames, coarse_distance = cross_correlate_signatures(
-        ref_sigs, dist_sigs, compare_type
+        ref_sigs,
+        dist_sigs,
+        compare_type,
+        min_overlap=1 if max_search_offset else _min_overlap(ref_sigs, dist_sigs),
     )
     coarse_offset_seconds = coarse_offset_frames / coarse_fps + start_offset
 
@@ -123,6 +444,10 @@ def find_offset(
     current_distance = coarse_distance
     current_fps = coarse_fps
 
+    # Native FPS signatures decoded so far: (start_time, duration, bundle)
+    ref_native_cache = ref_range_cache
+    dist_native_cache = dist_range_cache
+
     # Phase 2: Intermediate refinement (if fine_fps specified and different from coarse)
     if fine_fps > coarse_fps:
         logging.debug(f"Phase 2: Fine search at {fine_fps} fps")
@@ -133,42 +458,71 @@ def find_offset(
         if current_offset >= 0:
             ref_fine_start = max(0, current_offset - refine_window)
             dist_fine_start = 0.0
+            ref_window, dist_window = long_fine_duration, fine_duration
         else:
             ref_fine_start = 0.0
             dist_fine_start = max(0, -current_offset - refine_window)
-
-        fine_duration = min(refine_window * 2, max_duration or dist_info.duration)
-
-        ref_sigs_fine = compute_video_signatures(
-            ref_path,
-            fine_fps,
-            compare_type,
-            hash_size,
-            start_time=ref_fine_start,
-            max_duration=fine_duration + refine_window,
-            desc="Reference (fine)",
-            quiet=quiet,
+            ref_window, dist_window = fine_duration, long_fine_duration
+
+        # When phase 3 follows, decode the fine windows once at native FPS: the
+        # fine signatures are subsampled from them, and phase 3 can usually
+        # slice its narrower windows out of them without decoding again. Other
+        # compare types only compute the frames phase 3 compares, in phase 3.
+        fps_list = [fine_fps]
+        if (
+            frame_accurate
+            and compare_type in NATIVE_REUSE_TYPES
+            and native_fps > fine_fps
+        ):
+            fps_list.append(native_fps)
+
+        ref_multires, dist_multires = _run_pair(
+            functools.partial(
+                _window_signatures_multires,
+                ref_native_cache,
+                ref_path,
+                fps_list,
+                compare_type,
+                hash_size,
+                start_time=ref_fine_start,
+                max_duration=ref_window,
+                desc="Reference (fine)",
+                quiet=quiet,
+            ),
+            functools.partial(
+                _window_signatures_multires,
+                dist_native_cache,
+                dist_path,
+                fps_list,
+                compare_type,
+                hash_size,
+                start_time=dist_fine_start,
+                max_duration=dist_window,
+                desc="Distorted (fine)",
+                quiet=quiet,
+            ),
         )
 
-        dist_sigs_fine = compute_video_signatures(
-            dist_path,
-            fine_fps,
+        ref_sigs_fine = ref_multires[fine_fps]
+        dist_sigs_fine = dist_multires[fine_fps]
+        if native_fps in ref_multires:
+            ref_native_cache = (ref_fine_start, ref_window, ref_multires[native_fps])
+            dist_native_cache = (
+                dist_fine_start,
+                dist_window,
+                dist_multires[native_fps],
+            )
+
+        # The whole window is searched, as the coarse result may be off by more
+        # than refine_window when few frames overlap
+        current_offset, current_distance = _correlate_windows(
+            ref_sigs_fine,
+            dist_sigs_fine,
             compare_type,
-            hash_size,
-            start_time=dist_fine_start,
-            max_duration=fine_duration,
-            desc="Distorted (fine)",
-            quiet=quiet,
-        )
-
-        fine_offset_frames, fine_distance = cross_correlate_signatures(
-            ref_sigs_fine, dist_sigs_fine, compare_type
-        )
-        # Account for both start positions when calculating final offset
-        current_offset = (
-            fine_offset_frames / fine_fps + ref_fine_start - dist_fine_start
+            fine_fps,
+            ref_fine_start,
+            dist_fine_start,
         )
-        current_distance = fine_distance
         current_fps = fine_fps
 
         logging.debug(
@@ -181,47 +535,66 @@ def find_offset(
             f"Phase 3: Frame-accurate search at {native_fps:.2f} fps (native)"
         )
 
-        # Narrow window for final refinement (0.5s should be plenty after fine search)
-        frame_window = 0.5
+        # Narrow window for final refinement, scaled to the previous step
+        frame_window = min(FRAME_WINDOW_STEPS / current_fps, refine_window)
         # Only need to analyze a few seconds of each video
         frame_duration = min(frame_window * 2, dist_info.duration)
 
-        # Calculate search windows for both videos based on offset sign
+        # Calculate search windows for both videos based on offset sign, the
+        # video the match starts later in gets the longer window
         if current_offset >= 0:
             ref_frame_start = max(0, current_offset - frame_window)
             dist_frame_start = 0.0
+            ref_window = frame_duration + frame_window
+            dist_window = frame_duration
         else:
             ref_frame_start = 0.0
             dist_frame_start = max(0, -current_offset - frame_window)
-
-        ref_sigs_native = compute_video_signatures(
-            ref_path,
-            native_fps,
-            compare_type,
-            hash_size,
-            start_time=ref_frame_start,
-            max_duration=frame_duration + frame_window,
-            desc="Reference (native)",
-            quiet=quiet,
+            ref_window = frame_duration
+            dist_window = frame_duration + frame_window
+
+        ref_sigs_native, dist_sigs_native = _run_pair(
+            functools.partial(
+                _window_signatures,
+                ref_native_cache,
+                ref_path,
+                native_fps,
+                compare_type,
+                hash_size,
+                start_time=ref_frame_start,
+                max_duration=ref_window,
+                desc="Reference (native)",
+                quiet=quiet,
+            ),
+            functools.partial(
+                _window_signatures,
+                dist_native_cache,
+                dist_path,
+                native_fps,
+                compare_type,
+                hash_size,
+                start_time=dist_frame_start,
+                max_duration=dist_window,
+                desc="Distorted (native)",
+                quiet=quiet,
+            ),
         )
 
-        dist_sigs_native = compute_video_signatures(
-            dist_path,
+        # Only offsets within frame_window of the fine result are searched
+        expected_frames, window_frames = _offset_window(
+            current_offset - ref_frame_start + dist_frame_start,
+            frame_window,
             native_fps,
-            compare_type,
-            hash_size,
-            start_time=dist_frame_start,
-            max_duration=frame_duration,
-            desc="Distorted (native)",
-            quiet=quiet,
-        )
-
-        native_offset_frames, native_distance = cross_correlate_signatures(
-            ref_sigs_native, dist_sigs_native, compare_type
         )
-        # Account for both start positions when calculating final offset
-        native_offset_seconds = (
-            native_offset_frames / native_fps + ref_frame_start - dist_frame_start
+        native_offset_seconds, native_distance = _correlate_windows(
+            ref_sigs_native,
+            dist_sigs_native,
+            compare_type,
+            native_fps,
+            ref_frame_start,
+            dist_frame_start,
+            min_offset=expected_frames - window_frames,
+            max_offset=expected_frames + window_frames,
         )
 
         logging.debug(
@@ -1,62 +1,294 @@
 """Perceptual hashing and comparison functions for video frames."""
 
+import functools
 import math
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Sequence, Union
+from typing import Callable, Iterator, Optional, Sequence, Union
 
 import imagehash
 import numpy as np
 from PIL import Image
 from tqdm import tqdm
 
-from .models import CompareType
-from .video import extract_frames, get_video_info
-
-# Type alias for frame signatures (either hash or pixel array)
-FrameSignature = Union[imagehash.ImageHash, np.ndarray]
+from .models import CompareType, SignatureBundle
+from .video import (
+    RESIZE_INTERPOLATION,
+    extract_frames,
+    get_video_info,
+    resize_frame,
+)
 
 # Default resize dimensions for SAD comparison
 SAD_RESIZE_WIDTH = 64
 SAD_RESIZE_HEIGHT = 64
 
+# Number of frames hashed together by compute_hashes_batch
+HASH_BATCH_SIZE = 64
+
+# Maximum number of submitted batches not yet collected per hashing worker,
+# bounds frame memory
+MAX_PENDING_BATCHES_PER_WORKER = 2
+
+# Hash types that compute_hashes_batch can compute in one vectorized pass
+BATCHED_HASH_TYPES = (CompareType.PHASH, CompareType.DHASH, CompareType.AHASH)
+
+# Oversampling factor for pHash input images (same as imagehash's default)
+PHASH_HIGHFREQ_FACTOR = 4
+
+# pHash DCT coefficients smaller than this are treated as exactly zero
+DCT_ZERO_TOLERANCE = 1e-6
+
+# Above this many (ref, dist) frame pairs and offsets, hash cross-correlation
+# uses the FFT. Narrower offset ranges are faster to compute directly.
+FFT_MIN_FRAME_PAIRS = 1000
+FFT_MIN_OFFSETS = 256
+
+# Maximum size of the temporary array used when computing SAD between frames
+SAD_BLOCK_ELEMENTS = 1 << 18
+
+# Pixels per segment whose sums give the lower bound of the SAD search
+SAD_BOUND_SEGMENT = 64
+
+# Maximum size of the temporary arrays used when summing distances per offset
+OFFSET_SUM_BLOCK_ELEMENTS = 1 << 16
+
+
+def _to_gray(frame: Union[np.ndarray, Image.Image]) -> np.ndarray:
+    """Convert a PIL image or an RGB(A)/grayscale array to a grayscale uint8 frame."""
+    if isinstance(frame, Image.Image):
+        return np.asarray(frame.convert("L"))
+    if frame.ndim == 3:
+        return np.asarray(
+            Image.fromarray(np.asarray(frame, dtype=np.uint8)).convert("L")
+        )
+    if frame.ndim != 2:
+        raise ValueError(f"Expected a 2D or 3D frame, got shape {frame.shape}")
+    return np.asarray(frame, dtype=np.uint8)
+
 
 def compute_hash(
-    image: Image.Image,
+    frame: Union[np.ndarray, Image.Image],
     compare_type: CompareType = CompareType.PHASH,
     hash_size: int = 16,
 ) -> imagehash.ImageHash:
-    """Compute perceptual hash of an image."""
+    """
+    Compute perceptual hash of a frame.
+
+    The frame may be a grayscale uint8 array, an RGB(A) array or a PIL image;
+    color input is converted to grayscale first. pHash, dHash and aHash go
+    through compute_hashes_batch, so the result has the same bits as the
+    signatures computed by compute_video_signatures.
+    """
+    frame = _to_gray(frame)
+    if compare_type in BATCHED_HASH_TYPES:
+        packed = compute_hashes_batch(frame[np.newaxis], compare_type, hash_size)[0]
+        bits = np.unpackbits(packed)[: hash_size * hash_size]
+        return imagehash.ImageHash(bits.reshape(hash_size, hash_size).astype(bool))
+    elif compare_type == CompareType.WHASH:
+        return imagehash.whash(Image.fromarray(frame), hash_size=hash_size)
+    else:
+        raise ValueError(f"Unknown hash type: {compare_type}")
+
+
+def hash_input_size(compare_type: CompareType, hash_size: int) -> tuple[int, int]:
+    """
+    Return the (width, height) a grayscale frame is resized to before hashing.
+
+    Only defined for the hash types in BATCHED_HASH_TYPES.
+    """
     if compare_type == CompareType.PHASH:
-        return imagehash.phash(image, hash_size=hash_size)
+        img_size = hash_size * PHASH_HIGHFREQ_FACTOR
+        return img_size, img_size
     elif compare_type == CompareType.DHASH:
-        return imagehash.dhash(image, hash_size=hash_size)
+        return hash_size + 1, hash_size
     elif compare_type == CompareType.AHASH:
-        return imagehash.average_hash(image, hash_size=hash_size)
-    elif compare_type == CompareType.WHASH:
-        return imagehash.whash(image, hash_size=hash_size)
+        return hash_size, hash_size
     else:
-        raise ValueError(f"Unknown hash type: {compare_type}")
+        raise ValueError(f"Hash type cannot be batched: {compare_type}")
+
+
+def signature_width(compare_type: CompareType, hash_size: int) -> int:
+    """Return the number of uint8 values in one signature row."""
+    if compare_type == CompareType.SAD:
+        return SAD_RESIZE_WIDTH * SAD_RESIZE_HEIGHT
+    return math.ceil(hash_size * hash_size / 8)
+
+
+def _split_threads(threads: Optional[int]) -> tuple[Optional[int], int]:
+    """
+    Split a thread budget into decoder threads and hashing workers.
+
+    Without a budget, FFmpeg picks the decoder thread count and every core
+    gets a hashing worker.
+    """
+    if threads is None:
+        return None, os.cpu_count() or 1
+    decode_threads = max(1, threads // 2)
+    return decode_threads, max(1, threads - decode_threads)
+
+
+def _whash_image_scale(width: int, height: int, hash_size: int) -> int:
+    """Size of the square image imagehash.whash resizes a width x height image to."""
+    return max(2 ** int(math.log2(min(width, height))), hash_size)
+
+
+def compute_hashes_batch(
+    frames: np.ndarray,
+    compare_type: CompareType = CompareType.PHASH,
+    hash_size: int = 16,
+) -> np.ndarray:
+    """
+    Compute perceptual hashes for a batch of grayscale frames at once.
+
+    For frames already at hash_input_size(), this produces the same bits as
+    the corresponding imagehash function, but the DCT/comparison runs once
+    over the whole batch instead of once per frame.
+
+    Args:
+        frames: Array of shape (N, H, W) with uint8 grayscale frames. Frames that
+            are not already at hash_input_size() are resized first.
+        compare_type: Hash algorithm (phash, dhash or ahash)
+        hash_size: Hash size
+
+    Returns:
+        Array of shape (N, ceil(hash_size * hash_size / 8)) with the hash bits
+        packed into uint8 (see np.packbits)
+    """
+    if hash_size < 2:
+        raise ValueError("Hash size must be greater than or equal to 2")
+
+    width, height = hash_input_size(compare_type, hash_size)
+    n_frames = len(frames)
+    if not n_frames:
+        return np.empty((0, math.ceil(hash_size * hash_size / 8)), dtype=np.uint8)
+
+    if frames.shape[1:] != (height, width):
+        resized = np.empty((n_frames, height, width), dtype=np.uint8)
+        for i, frame in enumerate(frames):
+            resized[i] = resize_frame(frame, width, height)
+        frames = resized
+
+    if compare_type == CompareType.PHASH:
+        # Only the low-frequency block is needed, so the DCT is computed as
+        # basis @ pixels @ basis.T instead of transforming the whole image
+        basis = _dct_basis(width, hash_size)
+        dct_low = basis @ frames @ basis.T
+        # Snap round-off noise to zero, where a full DCT gives exact zeros
+        # (e.g. flat frames), so the median comparison matches imagehash
+        dct_low[np.abs(dct_low) < DCT_ZERO_TOLERANCE] = 0
+        bits = dct_low > np.median(dct_low, axis=(1, 2), keepdims=True)
+    elif compare_type == CompareType.DHASH:
+        bits = frames[:, :, 1:] > frames[:, :, :-1]
+    else:
+        # pixel > sum / n, kept in integers
+        pixels = frames.astype(np.uint32)
+        sums = pixels.sum(axis=(1, 2), keepdims=True, dtype=np.uint32)
+        bits = pixels * np.uint32(width * height) > sums
+
+    return np.packbits(bits.reshape(n_frames, -1), axis=1)
+
+
+@functools.lru_cache(maxsize=8)
+def _dct_basis(size: int, n_coeffs: int) -> np.ndarray:
+    """First n_coeffs rows of the unnormalized DCT-II matrix (as in scipy.fft.dct)."""
+    k = np.arange(n_coeffs)[:, np.newaxis]
+    n = np.arange(size)[np.newaxis, :]
+    basis = 2 * np.cos(np.pi * k * (2 * n + 1) / (2 * size))
+    # Every caller shares the cached array, so it must not be modified
+    basis.setflags(write=False)
+    return basis
+
+
+_POPCOUNT_LUT_8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+# Counts for every 16-bit value, so a uint64 word takes four lookups
+_POPCOUNT_LUT_16 = (_POPCOUNT_LUT_8[:, np.newaxis] + _POPCOUNT_LUT_8).ravel()
+
+
+def _popcount_lut(x: np.ndarray) -> np.ndarray:
+    """Count set bits per 16-bit chunk (or byte) of an unsigned integer array."""
+    x = np.ascontiguousarray(x)
+    if x.itemsize > 1 or x.shape[-1] % 2 == 0:
+        return np.take(_POPCOUNT_LUT_16, x.view(np.uint16))
+    return np.take(_POPCOUNT_LUT_8, x)
+
+
+def _popcount_rows_lut(x: np.ndarray) -> np.ndarray:
+    """Count set bits along the last axis of an unsigned integer array."""
+    counts = _popcount_lut(x)
+    return counts.reshape(*x.shape[:-1], -1).sum(axis=-1, dtype=np.int64)
+
+
+if hasattr(np, "bitwise_count"):
+
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        """Count set bits per element of an unsigned integer array."""
+        return np.bitwise_count(x)
+
+    def _popcount_rows(x: np.ndarray) -> np.ndarray:
+        """Count set bits along the last axis of an unsigned integer array."""
+        return np.bitwise_count(x).sum(axis=-1)
+
+else:  # NumPy < 2.0
+    _popcount = _popcount_lut
+    _popcount_rows = _popcount_rows_lut
+
+
+def _to_uint64_words(packed: np.ndarray) -> np.ndarray:
+    """View rows of packed hash bytes as uint64 words, zero-padding each row."""
+    n_rows, n_bytes = packed.shape
+    n_words = -(-n_bytes // 8)
+    if n_bytes == n_words * 8:
+        return np.ascontiguousarray(packed).view(np.uint64)
+    padded = np.zeros((n_rows, n_words * 8), dtype=np.uint8)
+    padded[:, :n_bytes] = packed
+    return padded.view(np.uint64)
+
+
+def hamming_distance(a: np.ndarray, b: np.ndarray) -> int:
+    """Count the differing bits between two packed hashes."""
+    return int(_popcount_rows(np.bitwise_xor(a, b)))
+
+
+def hamming_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Count the differing bits between packed hashes, row by row.
+
+    Args:
+        a: Packed hashes of shape (..., K), e.g. SignatureBundle.signatures
+        b: Packed hashes broadcastable against a, e.g. a single (K,) hash
+
+    Returns:
+        Integer array with the Hamming distance of every row
+    """
+    xor = np.bitwise_xor(a, b)
+    n_bytes = xor.shape[-1]
+    if n_bytes % 8 == 0:
+        # Count whole 64-bit words instead of single bytes
+        xor = np.ascontiguousarray(xor).view(np.uint64)
+    return _popcount_rows(xor)
 
 
 def compute_sad_signature(
-    image: Image.Image,
+    frame: Union[np.ndarray, Image.Image],
     width: int = SAD_RESIZE_WIDTH,
     height: int = SAD_RESIZE_HEIGHT,
 ) -> np.ndarray:
     """
-    Compute SAD signature (resized grayscale pixel array) of an image.
+    Compute SAD signature (resized grayscale pixel array) of a frame.
 
     Args:
-        image: PIL Image to process
-        width: Target width for resizing
-        height: Target height for resizing
+        frame: Grayscale uint8 frame of shape (H, W), or an RGB(A) array or
+            PIL image, which is converted to grayscale first
+        width: Target width for resizing (skipped if the frame already matches)
+        height: Target height for resizing (skipped if the frame already matches)
 
     Returns:
-        Flattened numpy array of grayscale pixel values (0-255)
+        Flattened uint8 array of grayscale pixel values (0-255)
     """
-    # Convert to grayscale and resize
-    gray = image.convert("L").resize((width, height), Image.Resampling.LANCZOS)
-    return np.array(gray, dtype=np.float32).flatten()
+    return resize_frame(_to_gray(frame), width, height).ravel()
 
 
 def compute_video_signatures(
@@ -69,7 +301,9 @@ def compute_video_signatures(
     max_frames: Optional[int] = None,
     desc: str = "Computing signatures",
     quiet: bool = False,
-) -> list[tuple[float, FrameSignature]]:
+    keyframes_only: bool = False,
+    threads: Optional[int] = None,
+) -> SignatureBundle:
     """
     Compute frame signatures (hashes or SAD arrays) for video frames.
 
@@ -83,173 +317,541 @@ def compute_video_signatures(
         max_frames: Maximum number of frames to process
         desc: Description for progress bar
         quiet: If True, suppress progress bar
+        keyframes_only: If True, only decode keyframes (see extract_frames)
+        threads: Threads shared by decoding and hashing (default: all cores)
 
     Returns:
-        List of (timestamp, signature) tuples
+        SignatureBundle with one timestamp and one signature row per frame
     """
-    signatures: list[tuple[float, FrameSignature]] = []
+    timestamps: list[float] = []
+    # Signature rows are gathered per batch and concatenated once at the end
+    signature_chunks: list[np.ndarray] = []
+
+    video_info = get_video_info(path)
+
+    # Let the decoder resize frames to the size the signature needs
+    interpolation = RESIZE_INTERPOLATION
+    if compare_type == CompareType.SAD:
+        out_size = (SAD_RESIZE_WIDTH, SAD_RESIZE_HEIGHT)
+    elif compare_type in BATCHED_HASH_TYPES:
+        out_size = hash_input_size(compare_type, hash_size)
+    else:
+        scale = _whash_image_scale(video_info.width, video_info.height, hash_size)
+        out_size = (scale, scale)
+        # The wavelet hash is sensitive to the scaler, so use the Lanczos
+        # filter imagehash.whash resizes with
+        interpolation = "LANCZOS"
+
+    decode_threads, hash_workers = _split_threads(threads)
     frames = extract_frames(
         path,
         fps,
         start_time=start_time,
         max_duration=max_duration,
         max_frames=max_frames,
+        out_width=out_size[0],
+        out_height=out_size[1],
+        interpolation=interpolation,
+        keyframes_only=keyframes_only,
+        threads=decode_threads,
     )
 
     # Estimate total frames for progress bar
     # Use ceiling to avoid underestimating (which causes tqdm to drop the progress bar)
-    video_info = get_video_info(path)
     duration = max_duration or (video_info.duration - start_time)
     estimated_frames = min(
         math.ceil(duration * fps) + 1 if duration > 0 else video_info.frame_count,
         max_frames or float("inf"),
     )
 
-    for timestamp, image in tqdm(
-        frames, total=estimated_frames, desc=desc, disable=quiet
-    ):
-        sig: FrameSignature
-        if compare_type == CompareType.SAD:
-            sig = compute_sad_signature(image)
+    # Frames are decoded here and hashed in batches on worker threads, so
+    # decoding the next batch overlaps with hashing the previous ones
+    batch_frames: list[np.ndarray] = []
+    pending: deque[Future[np.ndarray]] = deque()
+
+    # The bar advances once per hashed batch; disable=None hides it when
+    # stderr is not a terminal
+    progress = tqdm(
+        total=estimated_frames,
+        desc=desc,
+        mininterval=0.5,
+        miniters=max(1, int(estimated_frames) // 200),
+        smoothing=0,
+        disable=True if quiet else None,
+    )
+
+    def collect_oldest() -> None:
+        batch_signatures = pending.popleft().result()
+        signature_chunks.append(batch_signatures)
+        progress.update(len(batch_signatures))
+
+    with progress:
+        if compare_type == CompareType.WHASH:
+            # Wavelet hash inputs can be large, so they are hashed as they are
+            # decoded instead of being queued for worker threads
+            for timestamp, frame in frames:
+                timestamps.append(timestamp)
+                image_hash = compute_hash(frame, compare_type, hash_size)
+                signature_chunks.append(
+                    np.packbits(image_hash.hash.reshape(1, -1), axis=1)
+                )
+                progress.update()
         else:
-            sig = compute_hash(image, compare_type, hash_size)
-        signatures.append((timestamp, sig))
+            with ThreadPoolExecutor(max_workers=hash_workers) as pool:
+
+                def submit_batch() -> None:
+                    future = pool.submit(
+                        _compute_signature_batch,
+                        np.stack(batch_frames),
+                        compare_type,
+                        hash_size,
+                    )
+                    pending.append(future)
+                    batch_frames.clear()
+                    while len(pending) > MAX_PENDING_BATCHES_PER_WORKER * hash_workers:
+                        collect_oldest()
+
+                for timestamp, frame in frames:
+                    timestamps.append(timestamp)
+                    batch_frames.append(frame)
+                    if len(batch_frames) >= HASH_BATCH_SIZE:
+                        submit_batch()
+
+                if batch_frames:
+                    submit_batch()
+                while pending:
+                    collect_oldest()
+
+    # extract_frames yields every source frame when fps exceeds the source rate
+    sampled_fps = None if keyframes_only else min(fps, video_info.fps)
+    if not signature_chunks:
+        return SignatureBundle(
+            np.empty(0, dtype=np.float64),
+            np.empty((0, signature_width(compare_type, hash_size)), dtype=np.uint8),
+            sampled_fps,
+        )
+    return SignatureBundle(
+        np.array(timestamps, dtype=np.float64),
+        np.concatenate(signature_chunks),
+        sampled_fps,
+    )
 
-    return signatures
 
+def _compute_signature_batch(
+    frames: np.ndarray, compare_type: CompareType, hash_size: int
+) -> np.ndarray:
+    """Compute signature rows for a stack of decoded frames (runs in a worker thread)."""
+    if compare_type == CompareType.SAD:
+        # Frames were already resized to the SAD size by the decoder
+        return frames.reshape(len(frames), -1)
+    return compute_hashes_batch(frames, compare_type, hash_size)
 
-def hash_to_array(h: imagehash.ImageHash) -> np.ndarray:
-    """Convert ImageHash to numpy array of bits."""
-    return np.array(h.hash.flatten(), dtype=np.int8)
+
+def compute_video_signatures_multires(
+    path: Path,
+    fps_list: Sequence[float],
+    compare_type: CompareType = CompareType.PHASH,
+    hash_size: int = 16,
+    start_time: float = 0,
+    max_duration: Optional[float] = None,
+    desc: str = "Computing signatures",
+    quiet: bool = False,
+    threads: Optional[int] = None,
+) -> dict[float, SignatureBundle]:
+    """
+    Compute signatures at several frame rates from a single decode.
+
+    The video is decoded once at the highest rate in fps_list, and the lower
+    rates are subsampled from it. When the highest rate is at least the
+    source frame rate, every bundle matches what compute_video_signatures
+    would return for that rate.
+
+    Args:
+        path: Video file path
+        fps_list: Frame rates to compute signatures for
+        compare_type: Comparison algorithm to use
+        hash_size: Hash size (only used for hash-based methods)
+        start_time: Start time in seconds
+        max_duration: Maximum duration to process
+        desc: Description for progress bar
+        quiet: If True, suppress progress bar
+        threads: Threads shared by decoding and hashing (default: all cores)
+
+    Returns:
+        Dict mapping each frame rate to its SignatureBundle
+    """
+    high_fps = max(fps_list)
+    high = compute_video_signatures(
+        path,
+        high_fps,
+        compare_type,
+        hash_size,
+        start_time=start_time,
+        max_duration=max_duration,
+        desc=desc,
+        quiet=quiet,
+        threads=threads,
+    )
+    # The decoded frames are sampled like extract_frames samples source frames
+    decoded_fps = min(get_video_info(path).fps, high_fps)
+    return resample_signatures(high, decoded_fps, fps_list)
+
+
+def resample_signatures(
+    bundle: SignatureBundle, bundle_fps: float, fps_list: Sequence[float]
+) -> dict[float, SignatureBundle]:
+    """
+    Subsample signatures to several lower frame rates.
+
+    Args:
+        bundle: Signatures sampled at bundle_fps
+        bundle_fps: Rate at which the bundle samples the source frames (at most
+            the source frame rate)
+        fps_list: Frame rates to subsample to, rates of at least bundle_fps
+            return the bundle itself
+
+    Returns:
+        Dict mapping each frame rate to its SignatureBundle
+    """
+    return {
+        fps: bundle if fps >= bundle_fps else _subsample(bundle, bundle_fps, fps)
+        for fps in fps_list
+    }
+
+
+def _subsample(
+    bundle: SignatureBundle, bundle_fps: float, fps: float
+) -> SignatureBundle:
+    """Keep frames at the given rate, using extract_frames' sampling rule."""
+    frame_interval = bundle_fps / fps
+    keep = []
+    next_sample_idx: float = 0
+    for i in range(len(bundle)):
+        if i >= next_sample_idx:
+            keep.append(i)
+            next_sample_idx += frame_interval
+    return SignatureBundle(bundle.timestamps[keep], bundle.signatures[keep], fps)
+
+
+def slice_signatures(
+    bundle: SignatureBundle,
+    start_time: float = 0,
+    max_duration: Optional[float] = None,
+) -> SignatureBundle:
+    """
+    Select the frames extract_frames would return for a time range.
+
+    Args:
+        bundle: Signatures to select from
+        start_time: Start time in seconds
+        max_duration: Maximum duration (seconds)
+
+    Returns:
+        SignatureBundle with the frames inside the range
+    """
+    mask = bundle.timestamps >= start_time
+    if max_duration:
+        mask &= (bundle.timestamps - start_time) <= max_duration
+    return SignatureBundle(bundle.timestamps[mask], bundle.signatures[mask], bundle.fps)
 
 
 def cross_correlate_signatures(
-    ref_sigs: list[tuple[float, FrameSignature]],
-    dist_sigs: list[tuple[float, FrameSignature]],
+    ref_sigs: SignatureBundle,
+    dist_sigs: SignatureBundle,
     compare_type: CompareType = CompareType.PHASH,
+    method: str = "auto",
+    min_offset: Optional[int] = None,
+    max_offset: Optional[int] = None,
+    min_overlap: int = 1,
 ) -> tuple[int, float]:
     """
     Find optimal alignment using cross-correlation of frame signatures.
 
     For hash-based methods, computes Hamming distance.
     For SAD, computes Sum of Absolute Differences.
+    Both bundles must have signature rows of the same width.
 
     Args:
-        ref_sigs: Reference video signatures (timestamp, signature)
-        dist_sigs: Distorted video signatures (timestamp, signature)
+        ref_sigs: Reference video signatures
+        dist_sigs: Distorted video signatures
         compare_type: Comparison algorithm being used
+        method: How hash distances are computed: "direct" (loop over offsets),
+            "fft" (FFT-based correlation) or "auto" (pick by problem size).
+            Ignored for SAD.
+        min_offset: Smallest offset (in frames) to consider, defaults to
+            -n_dist+min_overlap
+        max_offset: Largest offset (in frames) to consider, defaults to
+            n_ref-min_overlap
+        min_overlap: Fewest overlapping frames an offset needs to be considered
 
     Returns:
         Tuple of (best_offset_in_dist_frames, min_avg_distance)
     """
+    ref_width = ref_sigs.signatures.shape[1]
+    dist_width = dist_sigs.signatures.shape[1]
+    if ref_width != dist_width:
+        raise ValueError(
+            f"Signature widths differ: {ref_width} (reference) vs "
+            f"{dist_width} (distorted) values per frame"
+        )
+
+    n_ref = len(ref_sigs)
+    n_dist = len(dist_sigs)
+    if not n_ref or not n_dist:
+        return 0, float("inf")
+
+    # Offsets outside this range leave fewer than min_overlap frames overlapping
+    min_overlap = max(1, min_overlap)
+    lo = min_overlap - n_dist
+    hi = n_ref - min_overlap
+    if min_offset is not None:
+        lo = max(lo, min_offset)
+    if max_offset is not None:
+        hi = min(hi, max_offset)
+    if lo > hi:
+        return 0, float("inf")
+
     if compare_type == CompareType.SAD:
-        return _cross_correlate_sad(ref_sigs, dist_sigs)
+        avg_distances = _sweep_sad(ref_sigs.signatures, dist_sigs.signatures, lo, hi)
     else:
-        return _cross_correlate_hashes(ref_sigs, dist_sigs)
-
-
-def _cross_correlate_hashes(
-    ref_hashes: Sequence[tuple[float, FrameSignature]],
-    dist_hashes: Sequence[tuple[float, FrameSignature]],
-) -> tuple[int, float]:
+        avg_distances = _sweep_hashes(
+            ref_sigs.signatures, dist_sigs.signatures, lo, hi, method
+        )
+
+    # Ties resolve to the offset with the most overlapping frames, which are
+    # the most evidence for it, then to the one closest to the middle of the
+    # searched range, where callers center their expected offset
+    overlaps = _overlap_lengths(n_ref, n_dist, lo, hi)
+    best = np.flatnonzero(avg_distances == avg_distances.min())
+    best = best[overlaps[best] == overlaps[best].max()]
+    best_idx = int(best[np.argmin(np.abs(2 * best - (hi - lo)))])
+    return lo + best_idx, float(avg_distances[best_idx])
+
+
+def _sweep_hashes(
+    ref_packed: np.ndarray,
+    dist_packed: np.ndarray,
+    lo: int,
+    hi: int,
+    method: str = "auto",
+) -> np.ndarray:
     """
-    Find optimal alignment using cross-correlation of hash distances.
+    Compute the average Hamming distance at every offset from lo to hi.
 
-    This finds the global optimum by computing the total Hamming distance
-    at each possible offset.
-
-    Returns:
-        Tuple of (best_offset_in_dist_frames, min_avg_distance)
+    Hashes are given as rows of packed bits.
     """
-    ref_arrays = np.array([hash_to_array(h) for _, h in ref_hashes])  # type: ignore
-    dist_arrays = np.array([hash_to_array(h) for _, h in dist_hashes])  # type: ignore
-
-    n_ref = len(ref_arrays)
-    n_dist = len(dist_arrays)
+    if method == "auto":
+        n_pairs = int(_overlap_lengths(len(ref_packed), len(dist_packed), lo, hi).sum())
+        use_fft = n_pairs > FFT_MIN_FRAME_PAIRS and hi - lo + 1 > FFT_MIN_OFFSETS
+        method = "fft" if use_fft else "direct"
+
+    if method == "fft":
+        # The FFT correlates individual bit planes
+        return _hamming_sweep_fft(
+            np.unpackbits(ref_packed, axis=1),
+            np.unpackbits(dist_packed, axis=1),
+            lo,
+            hi,
+        )
+    elif method == "direct":
+        # XOR + popcount on whole 64-bit words
+        return _hamming_sweep_direct(
+            _to_uint64_words(ref_packed), _to_uint64_words(dist_packed), lo, hi
+        )
+    else:
+        raise ValueError(f"Unknown cross-correlation method: {method}")
 
-    # We slide dist over ref, looking for where dist starts relative to ref
-    # Positive offset means dist is delayed (starts later than ref)
-    # Negative offset means dist is ahead (starts before ref)
 
-    best_offset = 0
-    min_avg_distance = float("inf")
+def _overlap_lengths(n_ref: int, n_dist: int, lo: int, hi: int) -> np.ndarray:
+    """Number of overlapping frames for each offset from lo to hi."""
+    offsets = np.arange(lo, hi + 1)
+    return np.minimum(n_ref, offsets + n_dist) - np.maximum(0, offsets)
 
-    # Search range: from dist being fully ahead to fully behind
-    for offset in range(-n_dist + 1, n_ref):
-        # Determine overlap region
-        if offset >= 0:
-            ref_start = offset
-            dist_start = 0
-        else:
-            ref_start = 0
-            dist_start = -offset
 
-        ref_end = min(n_ref, offset + n_dist)
-        dist_end = dist_start + (ref_end - ref_start)
+def _hamming_sweep_fft(
+    ref_bits: np.ndarray, dist_bits: np.ndarray, lo: int, hi: int
+) -> np.ndarray:
+    """
+    Compute the average Hamming distance at every offset via FFT correlation.
 
-        if ref_end <= ref_start:
-            continue
+    With bits mapped to {-1, +1}, the dot product of two hashes with B bits
+    is B - 2 * hamming, so summing the per-bit cross-correlations over all
+    bits yields the total Hamming distance at every offset at once.
+    """
+    # Imported here since importing scipy.fft takes longer than most
+    # direct sweeps, and the CLI should not pay for it when it is not used
+    import scipy.fft
+
+    n_ref, n_bits = ref_bits.shape
+    n_dist = len(dist_bits)
+
+    # Correlate every bit plane and sum in the frequency domain, so only one
+    # inverse transform is needed
+    n_full = n_ref + n_dist - 1
+    n_fft = scipy.fft.next_fast_len(n_full, real=True)
+    spectrum = scipy.fft.rfft(_signed_bit_planes(ref_bits, n_fft), axis=1, workers=-1)
+    # Reversing dist turns the convolution into a correlation
+    spectrum *= scipy.fft.rfft(
+        _signed_bit_planes(dist_bits[::-1], n_fft), axis=1, workers=-1
+    )
+    corr = scipy.fft.irfft(spectrum.sum(axis=0), n=n_fft)
 
-        # Compute Hamming distances for overlapping frames
-        ref_slice = ref_arrays[ref_start:ref_end]
-        dist_slice = dist_arrays[dist_start:dist_end]
+    # Index j of the full correlation corresponds to offset j - (n_dist - 1)
+    corr = corr[lo + n_dist - 1 : hi + n_dist]
+    overlaps = _overlap_lengths(n_ref, n_dist, lo, hi)
+    total_distances = np.rint((n_bits * overlaps - corr) / 2)
+    return total_distances / overlaps
 
-        # Hamming distance = sum of XOR bits
-        distances = np.sum(ref_slice != dist_slice, axis=1)
-        avg_distance = np.mean(distances)
 
-        if avg_distance < min_avg_distance:
-            min_avg_distance = avg_distance
-            best_offset = offset
+def _signed_bit_planes(bits: np.ndarray, n_fft: int) -> np.ndarray:
+    """
+    Map (N, B) hash bits to {+1, -1} bit planes of shape (B, n_fft).
 
-    return best_offset, min_avg_distance
+    The planes are written straight into a zero-padded buffer, so the FFT
+    does not have to copy them again to pad them.
+    """
+    planes = np.zeros((bits.shape[1], n_fft))
+    signed = planes[:, : len(bits)]
+    signed[...] = bits.T
+    signed *= -2.0
+    signed += 1.0
+    return planes
 
 
-def _cross_correlate_sad(
-    ref_sigs: list[tuple[float, FrameSignature]],
-    dist_sigs: list[tuple[float, FrameSignature]],
-) -> tuple[int, float]:
+def _hamming_sweep_direct(
+    ref_arrays: np.ndarray, dist_arrays: np.ndarray, lo: int, hi: int
+) -> np.ndarray:
     """
-    Find optimal alignment using cross-correlation of SAD (Sum of Absolute Differences).
+    Compute the average Hamming distance at every offset from lo to hi directly.
 
-    Returns:
-        Tuple of (best_offset_in_dist_frames, min_avg_sad)
+    Hashes are given as rows of uint64 words (see _to_uint64_words).
     """
-    ref_arrays = np.array([sig for _, sig in ref_sigs])
-    dist_arrays = np.array([sig for _, sig in dist_sigs])
-
-    n_ref = len(ref_arrays)
-    n_dist = len(dist_arrays)
+    offset_sums = _offset_sums(
+        ref_arrays,
+        dist_arrays,
+        lo,
+        hi,
+        # Hamming distance = number of set bits in XOR
+        lambda ref_rows, dist_rows: _popcount(ref_rows ^ dist_rows),
+    )
+    return offset_sums / _overlap_lengths(len(ref_arrays), len(dist_arrays), lo, hi)
 
-    best_offset = 0
-    min_avg_sad = float("inf")
 
-    # Search range: from dist being fully ahead to fully behind
-    for offset in range(-n_dist + 1, n_ref):
-        # Determine overlap region
-        if offset >= 0:
-            ref_start = offset
-            dist_start = 0
-        else:
-            ref_start = 0
-            dist_start = -offset
+def _offset_sums(
+    ref_arrays: np.ndarray,
+    dist_arrays: np.ndarray,
+    lo: int,
+    hi: int,
+    pair_distances: Callable[[np.ndarray, np.ndarray], np.ndarray],
+) -> np.ndarray:
+    """
+    Sum the distances of all overlapping frame pairs at every offset lo to hi.
 
-        ref_end = min(n_ref, offset + n_dist)
-        dist_end = dist_start + (ref_end - ref_start)
+    pair_distances maps matching rows of ref and dist frames to per-element
+    distances, which are summed per row. Every (ref, dist) pair overlaps at
+    exactly one offset, so each pair within the offset range is computed
+    once, looping over whichever of offsets or ref frames is fewer.
+    """
+    n_ref = len(ref_arrays)
+    n_dist, n_columns = dist_arrays.shape
+    offset_sums = np.zeros(hi - lo + 1, dtype=np.float64)
+
+    if hi - lo + 1 <= n_ref:
+        # Narrow offset range: compare contiguous runs of frames per offset,
+        # in blocks whose temporaries stay in cache. Summing a whole block at
+        # once is much faster than summing it per row.
+        block_frames = max(1, OFFSET_SUM_BLOCK_ELEMENTS // n_columns)
+        for offset in range(lo, hi + 1):
+            start, stop = max(0, offset), min(n_ref, offset + n_dist)
+            for block_start in range(start, stop, block_frames):
+                block_stop = min(block_start + block_frames, stop)
+                offset_sums[offset - lo] += pair_distances(
+                    ref_arrays[block_start:block_stop],
+                    dist_arrays[block_start - offset : block_stop - offset],
+                ).sum()
+        return offset_sums
+
+    for i, ref_row, start, stop in _offset_band(ref_arrays, n_dist, lo, hi):
+        distances = pair_distances(ref_row, dist_arrays[start:stop]).sum(axis=-1)
+        _add_to_offsets(offset_sums, distances, i, start, lo)
+    return offset_sums
+
+
+def _offset_band(
+    ref_arrays: np.ndarray, n_dist: int, lo: int, hi: int
+) -> Iterator[tuple[int, np.ndarray, int, int]]:
+    """
+    Yield (i, ref_row, start, stop) for every ref frame that overlaps dist.
 
-        if ref_end <= ref_start:
-            continue
+    Offset k pairs ref frame i with dist frame i - k, so only dist frames
+    start <= j < stop are paired with ref frame i for offsets lo to hi.
+    """
+    for i in range(max(0, lo), min(len(ref_arrays), hi + n_dist)):
+        yield i, ref_arrays[i], max(0, i - hi), min(n_dist, i - lo + 1)
 
-        # Compute SAD for overlapping frames
-        ref_slice = ref_arrays[ref_start:ref_end]
-        dist_slice = dist_arrays[dist_start:dist_end]
 
-        # Sum of Absolute Differences per frame, then average
-        sad_per_frame = np.sum(np.abs(ref_slice - dist_slice), axis=1)
-        avg_sad = np.mean(sad_per_frame)
+def _add_to_offsets(
+    offset_sums: np.ndarray, distances: np.ndarray, i: int, start: int, lo: int
+) -> None:
+    """Add distances of ref frame i against dist frames start.. to their offsets."""
+    # Later dist frames belong to smaller offsets
+    end = i - start - lo + 1
+    offset_sums[end - len(distances) : end] += distances[::-1]
 
-        if avg_sad < min_avg_sad:
-            min_avg_sad = avg_sad
-            best_offset = offset
 
-    return best_offset, min_avg_sad
+def _sweep_sad(
+    ref_arrays: np.ndarray, dist_arrays: np.ndarray, lo: int, hi: int
+) -> np.ndarray:
+    """
+    Compute the average SAD (Sum of Absolute Differences) at offsets lo to hi.
+
+    This is a branch and bound search: for every segment of pixels,
+    |sum(a) - sum(b)| <= sum(|a - b|), so segment sums give a cheap lower
+    bound on the SAD of each offset. Offsets are evaluated exactly in order of
+    increasing bound until the bound exceeds the best average found. Offsets
+    not evaluated keep their bound, which is larger than the minimum, so the
+    argmin of the result is still the exact best offset.
+    """
+    n_ref = len(ref_arrays)
+    n_dist, n_pixels = dist_arrays.shape
+    overlaps = _overlap_lengths(n_ref, n_dist, lo, hi)
+
+    segment_starts = np.arange(0, n_pixels, SAD_BOUND_SEGMENT)
+    # Segment sums and their differences stay far below 2**31
+    ref_segments = np.add.reduceat(ref_arrays, segment_starts, axis=1, dtype=np.int32)
+    dist_segments = np.add.reduceat(dist_arrays, segment_starts, axis=1, dtype=np.int32)
+    bound_sums = _offset_sums(
+        ref_segments,
+        dist_segments,
+        lo,
+        hi,
+        lambda ref_rows, dist_rows: np.abs(ref_rows - dist_rows),
+    )
+    avg_sad = bound_sums / overlaps
+
+    # Scratch buffers are reused for every block instead of allocating
+    # new temporaries per operation
+    block_frames = max(1, SAD_BLOCK_ELEMENTS // n_pixels)
+    high = np.empty((block_frames, n_pixels), dtype=ref_arrays.dtype)
+    low = np.empty_like(high)
+    best_avg = float("inf")
+    for idx in np.argsort(avg_sad, kind="stable"):
+        if avg_sad[idx] > best_avg:
+            break
+        offset = lo + int(idx)
+        ref_start = max(0, offset)
+        dist_start = max(0, -offset)
+        total_sad = 0
+        for block_start in range(0, overlaps[idx], block_frames):
+            n_block = min(block_frames, overlaps[idx] - block_start)
+            ref_block = ref_arrays[ref_start + block_start :][:n_block]
+            dist_block = dist_arrays[dist_start + block_start :][:n_block]
+            # |a - b| = max(a, b) - min(a, b) stays in uint8 without overflow
+            np.maximum(ref_block, dist_block, out=high[:n_block])
+            np.minimum(ref_block, dist_block, out=low[:n_block])
+            np.subtract(high[:n_block], low[:n_block], out=high[:n_block])
+            total_sad += int(high[:n_block].sum())
+        avg_sad[idx] = total_sad / overlaps[idx]
+        best_avg = min(best_avg, avg_sad[idx])
+
+    return avg_sad
@@ -3,6 +3,9 @@
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
 
 
 class CompareType(str, Enum):
@@ -27,6 +30,18 @@ class VideoInfo:
     height: int
 
 
+@dataclass
+class SignatureBundle:
+    """Frame signatures of a video, stored as parallel arrays."""
+
+    timestamps: np.ndarray  # (N,) float64 frame timestamps in seconds
+    signatures: np.ndarray  # (N, K) uint8 packed hash bits or SAD pixels
+    fps: Optional[float] = None  # Rate the frames were sampled at, if uniform
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
 @dataclass
 class OffsetResult:
     """Result of offset detection."""
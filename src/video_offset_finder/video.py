@@ -1,17 +1,35 @@
 """Video processing utilities for frame extraction and metadata."""
 
+import dataclasses
+import functools
+import math
+import os
 from pathlib import Path
 from typing import Iterator, Optional
 
 import av
-from PIL import Image
+import numpy as np
 
 from .models import VideoInfo
 
+# Scaler used by libswscale when resizing frames
+RESIZE_INTERPOLATION = "AREA"
+
 
 def get_video_info(path: Path) -> VideoInfo:
-    """Extract video metadata using PyAV."""
-    with av.open(str(path)) as container:
+    """Extract video metadata using PyAV.
+
+    Results are cached per file and invalidated when its mtime or size change.
+    """
+    stat = os.stat(path)
+    info = _get_video_info_cached(str(path), stat.st_mtime_ns, stat.st_size)
+    return dataclasses.replace(info, path=path)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_video_info_cached(path: str, mtime_ns: int, size: int) -> VideoInfo:
+    """Probe video metadata; mtime_ns and size only serve as cache keys."""
+    with av.open(path) as container:
         stream = container.streams.video[0]
         fps = float(stream.average_rate or stream.base_rate or 25)
         time_base = stream.time_base or 1
@@ -19,7 +37,7 @@ def get_video_info(path: Path) -> VideoInfo:
         frame_count = stream.frames or int(duration * fps)
 
     return VideoInfo(
-        path=path,
+        path=Path(path),
         fps=fps,
         duration=duration,
         frame_count=frame_count,
@@ -28,15 +46,34 @@ def get_video_info(path: Path) -> VideoInfo:
     )
 
 
+def resize_frame(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize a grayscale uint8 frame with libswscale."""
+    if frame.shape == (height, width):
+        return frame
+    video_frame = av.VideoFrame.from_ndarray(frame, format="gray")
+    resized = video_frame.reformat(
+        width=width, height=height, interpolation=RESIZE_INTERPOLATION
+    )
+    return resized.to_ndarray()
+
+
 def extract_frames(
     path: Path,
     target_fps: float,
     start_time: float = 0,
     max_duration: Optional[float] = None,
     max_frames: Optional[int] = None,
-) -> Iterator[tuple[float, Image.Image]]:
+    out_width: Optional[int] = None,
+    out_height: Optional[int] = None,
+    interpolation: str = RESIZE_INTERPOLATION,
+    keyframes_only: bool = False,
+    threads: Optional[int] = None,
+) -> Iterator[tuple[float, np.ndarray]]:
     """
-    Extract frames from video at specified FPS.
+    Extract grayscale frames from video at specified FPS.
+
+    Conversion to grayscale and resizing are done by FFmpeg (libswscale) while
+    reformatting the decoded frame, so no full-size RGB image is created.
 
     Args:
         path: Video file path
@@ -44,14 +81,26 @@ def extract_frames(
         start_time: Start time in seconds (relative to video start, not PTS)
         max_duration: Maximum duration to extract (seconds)
         max_frames: Maximum number of frames to extract
+        out_width: Output frame width (default: source width)
+        out_height: Output frame height (default: source height)
+        interpolation: libswscale scaler used for resizing (e.g. "AREA", "LANCZOS")
+        keyframes_only: If True, only keyframes are decoded, and each sample is the
+            first keyframe in its 1/target_fps slot. Much faster, but samples
+            are missing wherever keyframes are further apart than 1/target_fps.
+        threads: Decoder threads (default: chosen by FFmpeg)
 
     Yields:
-        Tuple of (relative_timestamp_seconds, PIL.Image)
+        Tuple of (relative_timestamp_seconds, uint8 ndarray of shape (H, W))
         The timestamp is relative to the video start (0-based), not absolute PTS.
     """
     with av.open(str(path)) as container:
         stream = container.streams.video[0]
         stream.thread_type = "AUTO"
+        if threads is not None:
+            stream.thread_count = threads
+        if keyframes_only:
+            # The decoder drops all other frames without decoding them
+            stream.codec_context.skip_frame = "NONKEY"
 
         source_fps = float(stream.average_rate or stream.base_rate or 25)
         time_base = float(stream.time_base) if stream.time_base else 1.0
@@ -72,7 +121,8 @@ def extract_frames(
             # Now seek to target position (0.5s before start_time to account for keyframes)
             seek_time = max(0, start_time - 0.5)
             seek_pts = int(seek_time / time_base)
-            container.seek(seek_pts, stream=stream)
+            # Lands on the last keyframe before seek_pts, decoding starts there
+            container.seek(seek_pts, backward=True, any_frame=False, stream=stream)
 
         frames_in_range = 0  # Count frames within the extraction range
         next_sample_idx: float = 0  # Next frame index (within range) to sample
@@ -92,7 +142,7 @@ def extract_frames(
 
             relative_time = abs_timestamp - first_pts_time
 
-            # Skip frames before start_time
+            # Skip frames before start_time (decoded, but never reformatted)
             if relative_time < start_time:
                 continue
 
@@ -100,14 +150,29 @@ def extract_frames(
             if max_duration and (relative_time - start_time) > max_duration:
                 break
 
-            # Check frame limit
-            if max_frames and frames_yielded >= max_frames:
-                break
-
-            # Sample at target FPS (using frame count within extraction range)
-            if frames_in_range >= next_sample_idx:
-                yield relative_time, frame.to_image()
-                next_sample_idx += frame_interval
+            # Sample at target FPS (using frame count within extraction range,
+            # or the sampling slot for keyframes)
+            if keyframes_only:
+                sample_slot = math.floor((relative_time - start_time) * target_fps)
+                take_frame = sample_slot >= next_sample_idx
+            else:
+                take_frame = frames_in_range >= next_sample_idx
+
+            if take_frame:
+                gray = frame.reformat(
+                    width=out_width,
+                    height=out_height,
+                    format="gray8",
+                    interpolation=interpolation,
+                )
+                yield relative_time, gray.to_ndarray()
+                if keyframes_only:
+                    next_sample_idx = sample_slot + 1
+                else:
+                    next_sample_idx += frame_interval
                 frames_yielded += 1
+                # Stop before the decoder produces another frame
+                if max_frames and frames_yielded >= max_frames:
+                    break
 
             frames_in_range += 1
@@ -1,58 +1,128 @@
 """Pytest configuration and fixtures for video offset finder tests."""
 
+import functools
+import os
 from pathlib import Path
+from typing import Any, Callable
 
 import pytest
 
+from video_offset_finder import (
+    CompareType,
+    SignatureBundle,
+    compute_video_signatures,
+    finder,
+)
+
 # Base fixtures directory
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 SYNTHETIC_DIR = FIXTURES_DIR / "synthetic"
 BBB_DIR = FIXTURES_DIR / "bbb"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def synthetic_reference() -> Path:
     """Path to synthetic testsrc reference video (10s, 25fps, 160x90)."""
     return SYNTHETIC_DIR / "reference.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def synthetic_offset_2s() -> Path:
     """Synthetic video starting at 2s into reference."""
     return SYNTHETIC_DIR / "offset_2s.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def synthetic_offset_3p5s() -> Path:
     """Synthetic video starting at 3.5s into reference."""
     return SYNTHETIC_DIR / "offset_3p5s.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def synthetic_offset_5s() -> Path:
     """Synthetic video starting at 5s into reference."""
     return SYNTHETIC_DIR / "offset_5s.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bbb_reference() -> Path:
     """Path to Big Buck Bunny reference video (10s, 60fps, 160x90)."""
     return BBB_DIR / "reference.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bbb_offset_2s() -> Path:
     """Big Buck Bunny video starting at 2s into reference."""
     return BBB_DIR / "offset_2s.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bbb_offset_3p5s() -> Path:
     """Big Buck Bunny video starting at 3.5s into reference."""
     return BBB_DIR / "offset_3p5s.mp4"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bbb_offset_5s() -> Path:
     """Big Buck Bunny video starting at 5s into reference."""
     return BBB_DIR / "offset_5s.mp4"
+
+
+@pytest.fixture(scope="session")
+def bbb_reference_coarse_signatures(
+    bbb_reference: Path,
+) -> Callable[[int], SignatureBundle]:
+    """PHASH signatures of the Big Buck Bunny reference at 1 fps, by hash size.
+
+    Computed once per hash size and session, and passed to find_offset as
+    ref_signatures.
+    """
+
+    @functools.cache
+    def compute(hash_size: int) -> SignatureBundle:
+        return compute_video_signatures(
+            bbb_reference, 1.0, CompareType.PHASH, hash_size, quiet=True
+        )
+
+    return compute
+
+
+@pytest.fixture(scope="session")
+def signature_cache() -> dict[tuple[Any, ...], Any]:
+    """Signatures computed by find_offset, shared by all tests in the session."""
+    return {}
+
+
+@pytest.fixture
+def cached_signatures(
+    signature_cache: dict[tuple[Any, ...], Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Memoize the signature computations find_offset runs during a test.
+
+    Repeated searches over the same fixture videos and settings then share a
+    single decode per video, rate and time range.
+    """
+
+    def memoized(compute: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(compute)
+        def wrapper(path: Path, *args: Any, **kwargs: Any) -> Any:
+            # Progress bar and thread settings do not change the result
+            kwargs.pop("desc", None)
+            kwargs.pop("quiet", None)
+            kwargs.pop("threads", None)
+            key = (
+                compute.__name__,
+                str(path),
+                os.stat(path).st_mtime_ns,
+                # Frame rate lists are passed as lists
+                tuple(tuple(a) if isinstance(a, list) else a for a in args),
+                tuple(sorted(kwargs.items())),
+            )
+            if key not in signature_cache:
+                signature_cache[key] = compute(path, *args, quiet=True, **kwargs)
+            return signature_cache[key]
+
+        return wrapper
+
+    for name in ("compute_video_signatures", "compute_video_signatures_multires"):
+        monkeypatch.setattr(finder, name, memoized(getattr(finder, name)))
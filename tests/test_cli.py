@@ -1,14 +1,33 @@
 """Tests for CLI output format."""
 
 import json
+import logging
 import subprocess
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
+from video_offset_finder.cli import main
+
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+@pytest.fixture(autouse=True)
+def restore_logging() -> Iterator[None]:
+    """Undo the logging setup main() does, so it does not leak into other tests."""
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    level = root.level
+    yield
+    for handler in root.handlers[:]:
+        if handler not in handlers:
+            root.removeHandler(handler)
+            handler.close()
+    root.setLevel(level)
+    logging.disable(logging.NOTSET)
+
+
 class TestCliOutputFormat:
     """Test CLI JSON output format validation."""
 
@@ -20,29 +39,28 @@ class TestCliOutputFormat:
         ],
     )
     def test_json_output_format(
-        self, fixture_dir: str, ref_name: str, dist_name: str
+        self,
+        fixture_dir: str,
+        ref_name: str,
+        dist_name: str,
+        capsys: pytest.CaptureFixture[str],
     ) -> None:
         """Validate JSON output contains all required fields."""
         ref_path = FIXTURES_DIR / fixture_dir / ref_name
         dist_path = FIXTURES_DIR / fixture_dir / dist_name
 
-        result = subprocess.run(
+        main(
             [
-                "video-offset-finder",
                 str(ref_path),
                 str(dist_path),
                 "--coarse-fps",
                 "1",
                 "--fine-fps",
                 "5",
-            ],
-            capture_output=True,
-            text=True,
+            ]
         )
 
-        assert result.returncode == 0, f"CLI failed: {result.stderr}"
-
-        output = json.loads(result.stdout)
+        output = json.loads(capsys.readouterr().out)
 
         # Validate top-level fields
         assert "date" in output
@@ -66,3 +84,41 @@ class TestCliOutputFormat:
         ts = output["offset_timestamp"]
         assert len(ts) == 12, f"Timestamp wrong length: {ts}"
         assert ts[2] == ":" and ts[5] == ":" and ts[8] == "."
+
+    def test_quiet_suppresses_stderr(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """--quiet should leave only the JSON output."""
+        main(
+            [
+                str(FIXTURES_DIR / "synthetic" / "reference.mp4"),
+                str(FIXTURES_DIR / "synthetic" / "offset_2s.mp4"),
+                "--coarse-fps",
+                "1",
+                "--fine-fps",
+                "5",
+                "--quiet",
+            ]
+        )
+
+        captured = capsys.readouterr()
+        assert captured.err == ""
+        assert json.loads(captured.out)["offset_frames"] == 50
+
+    def test_console_script(self) -> None:
+        """The installed entry point should run and print JSON to stdout."""
+        result = subprocess.run(
+            [
+                "video-offset-finder",
+                str(FIXTURES_DIR / "synthetic" / "reference.mp4"),
+                str(FIXTURES_DIR / "synthetic" / "offset_2s.mp4"),
+                "--coarse-fps",
+                "1",
+                "--fine-fps",
+                "5",
+                "--quiet",
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, f"CLI failed: {result.stderr}"
+        assert json.loads(result.stdout)["offset_frames"] == 50
@@ -1,18 +1,34 @@
 """Tests for individual components: video utilities and hashing."""
 
+import importlib
+import shutil
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator
 
+import av
+import imagehash
+import numpy as np
 import pytest
 from PIL import Image
 
 from video_offset_finder import (
     CompareType,
+    SignatureBundle,
     compute_hash,
+    compute_hashes_batch,
     compute_sad_signature,
     compute_video_signatures,
+    compute_video_signatures_multires,
+    cross_correlate_signatures,
     extract_frames,
     get_video_info,
+    hamming_distance,
+    hamming_distances,
+    hashing,
+    slice_signatures,
 )
+from video_offset_finder.hashing import HASH_BATCH_SIZE, hash_input_size
 
 # Hash types (excluding SAD which is not a hash algorithm)
 HASH_TYPES = [
@@ -23,6 +39,15 @@ HASH_TYPES = [
 ]
 
 
+@pytest.fixture
+def popcount_fallback(monkeypatch: pytest.MonkeyPatch) -> Iterator[ModuleType]:
+    """The hashing module as loaded on NumPy < 2.0, without np.bitwise_count."""
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    yield importlib.reload(hashing)
+    monkeypatch.undo()
+    importlib.reload(hashing)
+
+
 class TestVideoInfo:
     """Tests for get_video_info function."""
 
@@ -46,31 +71,92 @@ class TestVideoInfo:
         assert 59 <= info.fps <= 61  # Should be ~60 fps
         assert 9 <= info.duration <= 11  # Should be ~10 seconds
 
+    def test_get_video_info_is_cached(
+        self, synthetic_reference: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test repeated calls reuse the probed metadata."""
+        first = get_video_info(synthetic_reference)
+        opened: list[str] = []
+        av_open = av.open
+
+        def counting_open(path: str, *args: Any, **kwargs: Any) -> Any:
+            opened.append(path)
+            return av_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(av, "open", counting_open)
+        info = get_video_info(synthetic_reference)
+
+        assert opened == []
+        assert info == first
+
+    def test_get_video_info_notices_changed_file(
+        self, synthetic_reference: Path, bbb_reference: Path, tmp_path: Path
+    ) -> None:
+        """Test replacing a file invalidates its cached metadata."""
+        video = tmp_path / "video.mp4"
+        shutil.copyfile(synthetic_reference, video)
+        before = get_video_info(video)
+
+        shutil.copyfile(bbb_reference, video)
+        after = get_video_info(video)
+
+        assert 24 <= before.fps <= 26
+        assert 59 <= after.fps <= 61
+
 
 class TestFrameExtraction:
     """Tests for extract_frames function."""
 
     def test_extract_frames_count(self, synthetic_reference: Path) -> None:
         """Test that frame extraction yields expected number of frames."""
-        frames = list(
-            extract_frames(synthetic_reference, target_fps=5.0, max_frames=10)
+        count = sum(
+            1
+            for _ in extract_frames(synthetic_reference, target_fps=5.0, max_frames=10)
         )
 
-        assert len(frames) == 10
+        assert count == 10
 
-    def test_extract_frames_yields_images(self, synthetic_reference: Path) -> None:
-        """Test that extracted frames are PIL Images."""
+    def test_extract_frames_yields_gray_arrays(self, synthetic_reference: Path) -> None:
+        """Test that extracted frames are grayscale uint8 arrays at source size."""
         frames = list(extract_frames(synthetic_reference, target_fps=1.0, max_frames=3))
 
-        for timestamp, image in frames:
+        for timestamp, frame in frames:
             assert isinstance(timestamp, float)
-            assert isinstance(image, Image.Image)
+            assert isinstance(frame, np.ndarray)
+            assert frame.dtype == np.uint8
+            assert frame.shape == (90, 160)
+
+    def test_extract_frames_resizes(self, synthetic_reference: Path) -> None:
+        """Test that frames are resized to the requested output size."""
+        frames = list(
+            extract_frames(
+                synthetic_reference,
+                target_fps=1.0,
+                max_frames=3,
+                out_width=64,
+                out_height=32,
+            )
+        )
+
+        for _, frame in frames:
+            assert frame.shape == (32, 64)
+
+    def test_extract_frames_thread_count(self, bbb_reference: Path) -> None:
+        """Test a fixed decoder thread count yields the same frames."""
+        default = list(extract_frames(bbb_reference, target_fps=5.0, max_frames=10))
+        single = list(
+            extract_frames(bbb_reference, target_fps=5.0, max_frames=10, threads=1)
+        )
+
+        assert [t for t, _ in single] == [t for t, _ in default]
+        for (_, a), (_, b) in zip(single, default):
+            assert np.array_equal(a, b)
 
     def test_extract_frames_timestamps_increase(self, bbb_reference: Path) -> None:
         """Test that timestamps increase monotonically."""
-        frames = list(extract_frames(bbb_reference, target_fps=5.0, max_frames=5))
-
-        timestamps = [t for t, _ in frames]
+        timestamps = [
+            t for t, _ in extract_frames(bbb_reference, target_fps=5.0, max_frames=5)
+        ]
         for i in range(1, len(timestamps)):
             assert timestamps[i] > timestamps[i - 1]
 
@@ -87,12 +173,33 @@ class TestFrameExtraction:
 
     def test_extract_frames_with_max_duration(self, synthetic_reference: Path) -> None:
         """Test frame extraction with max duration limit."""
-        frames = list(
-            extract_frames(synthetic_reference, target_fps=10.0, max_duration=1.0)
+        count = sum(
+            1
+            for _ in extract_frames(
+                synthetic_reference, target_fps=10.0, max_duration=1.0
+            )
         )
 
         # Should get roughly 10 frames in 1 second at 10 fps
-        assert 8 <= len(frames) <= 12
+        assert 8 <= count <= 12
+
+    def test_extract_frames_keyframes_only(self, bbb_reference: Path) -> None:
+        """Test keyframe-only extraction returns a subset of the keyframes."""
+        with av.open(str(bbb_reference)) as container:
+            stream = container.streams.video[0]
+            time_base = float(stream.time_base)
+            keyframe_times = {
+                packet.pts * time_base
+                for packet in container.demux(stream)
+                if packet.is_keyframe and packet.pts is not None
+            }
+
+        timestamps = [
+            t for t, _ in extract_frames(bbb_reference, 1.0, keyframes_only=True)
+        ]
+
+        assert timestamps
+        assert set(timestamps) <= keyframe_times
 
 
 class TestHashing:
@@ -101,9 +208,9 @@ class TestHashing:
     def test_compute_hash_returns_hash(self, synthetic_reference: Path) -> None:
         """Test that compute_hash returns an ImageHash."""
         frames = list(extract_frames(synthetic_reference, target_fps=1.0, max_frames=1))
-        _, image = frames[0]
+        _, frame = frames[0]
 
-        hash_result = compute_hash(image, CompareType.PHASH, hash_size=16)
+        hash_result = compute_hash(frame, CompareType.PHASH, hash_size=16)
 
         assert hash_result is not None
         assert len(str(hash_result)) > 0
@@ -114,34 +221,141 @@ class TestHashing:
     ) -> None:
         """Test all hash types produce valid hashes."""
         frames = list(extract_frames(synthetic_reference, target_fps=1.0, max_frames=1))
-        _, image = frames[0]
+        _, frame = frames[0]
 
-        hash_result = compute_hash(image, hash_type, hash_size=8)
+        hash_result = compute_hash(frame, hash_type, hash_size=8)
 
         assert hash_result is not None
 
     def test_sad_signature_works(self, synthetic_reference: Path) -> None:
         """Test SAD signature computation."""
         frames = list(extract_frames(synthetic_reference, target_fps=1.0, max_frames=1))
-        _, image = frames[0]
+        _, frame = frames[0]
 
-        sig = compute_sad_signature(image)
+        sig = compute_sad_signature(frame)
 
         assert sig is not None
         assert sig.shape == (64 * 64,)  # Default 64x64 grayscale
+        assert sig.dtype == np.uint8
 
-    def test_same_image_same_hash(self, synthetic_reference: Path) -> None:
-        """Test that the same image produces the same hash."""
+    def test_same_frame_same_hash(self, synthetic_reference: Path) -> None:
+        """Test that the same frame produces the same hash."""
         frames = list(extract_frames(synthetic_reference, target_fps=1.0, max_frames=1))
-        _, image = frames[0]
+        _, frame = frames[0]
 
-        hash1 = compute_hash(image, CompareType.PHASH, hash_size=16)
-        hash2 = compute_hash(image, CompareType.PHASH, hash_size=16)
+        hash1 = compute_hash(frame, CompareType.PHASH, hash_size=16)
+        hash2 = compute_hash(frame, CompareType.PHASH, hash_size=16)
 
         assert hash1 == hash2
 
+    @pytest.mark.parametrize("hash_type", HASH_TYPES)
+    def test_compute_hash_accepts_color_input(self, hash_type: CompareType) -> None:
+        """PIL images and RGB arrays should hash like their grayscale version."""
+        rng = np.random.default_rng(0)
+        rgb = rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+        image = Image.fromarray(rgb)
+        gray = np.asarray(image.convert("L"))
+
+        expected = compute_hash(gray, hash_type, hash_size=8)
+
+        assert compute_hash(image, hash_type, hash_size=8) == expected
+        assert compute_hash(rgb, hash_type, hash_size=8) == expected
+
+    def test_sad_signature_accepts_color_input(self) -> None:
+        """PIL images and RGB arrays should give the grayscale SAD signature."""
+        rng = np.random.default_rng(0)
+        rgb = rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+        image = Image.fromarray(rgb)
+        expected = compute_sad_signature(np.asarray(image.convert("L")))
+
+        for frame in (image, rgb, np.dstack([rgb, rgb[..., :1]])):
+            sig = compute_sad_signature(frame)
+            assert sig.dtype == np.uint8
+            np.testing.assert_array_equal(sig, expected)
+
+    @pytest.mark.parametrize(
+        "hash_type,imagehash_func",
+        [
+            (CompareType.PHASH, imagehash.phash),
+            (CompareType.DHASH, imagehash.dhash),
+            (CompareType.AHASH, imagehash.average_hash),
+        ],
+    )
+    def test_batch_hashes_match_imagehash(
+        self,
+        bbb_reference: Path,
+        hash_type: CompareType,
+        imagehash_func: Callable[..., imagehash.ImageHash],
+    ) -> None:
+        """Test batched hashing produces the same bits as imagehash."""
+        width, height = hash_input_size(hash_type, 16)
+        frames = np.stack(
+            [
+                frame
+                for _, frame in extract_frames(
+                    bbb_reference,
+                    target_fps=2.0,
+                    max_frames=8,
+                    out_width=width,
+                    out_height=height,
+                )
+            ]
+        )
+
+        batch = compute_hashes_batch(frames, hash_type, hash_size=16)
+
+        assert batch.shape == (8, 16 * 16 // 8)
+        for packed, frame in zip(batch, frames):
+            expected = imagehash_func(Image.fromarray(frame), hash_size=16)
+            assert np.array_equal(packed, np.packbits(expected.hash.flatten()))
+
+    def test_batch_phash_matches_imagehash_on_flat_frames(self) -> None:
+        """Test pHash parity where most DCT coefficients are exactly zero."""
+        size, _ = hash_input_size(CompareType.PHASH, 8)
+        gradient = np.tile(np.arange(size, dtype=np.uint8) * 8, (size, 1))
+        frames = np.stack(
+            [np.zeros((size, size), np.uint8), np.full((size, size), 128), gradient]
+        ).astype(np.uint8)
+
+        batch = compute_hashes_batch(frames, CompareType.PHASH, hash_size=8)
+
+        for packed, frame in zip(batch, frames):
+            expected = imagehash.phash(Image.fromarray(frame), hash_size=8)
+            assert np.array_equal(packed, np.packbits(expected.hash.flatten()))
+
+    def test_phash_batches_stay_correct_across_calls(self) -> None:
+        """Test later batches still match imagehash.phash after earlier ones."""
+        rng = np.random.default_rng(1)
+        frames = rng.integers(0, 256, size=(4, 32, 32), dtype=np.uint8)
+
+        first = compute_hashes_batch(frames, CompareType.PHASH, hash_size=8)
+        compute_hashes_batch(frames[:1], CompareType.PHASH, hash_size=8)
+        again = compute_hashes_batch(frames, CompareType.PHASH, hash_size=8)
+
+        assert np.array_equal(again, first)
+        for packed, frame in zip(again, frames):
+            expected = imagehash.phash(Image.fromarray(frame), hash_size=8)
+            assert np.array_equal(packed, np.packbits(expected.hash.flatten()))
+
+    def test_compute_hash_matches_batch(self, synthetic_reference: Path) -> None:
+        """Test compute_hash agrees with compute_hashes_batch on full-size frames."""
+        frames = np.stack(
+            [
+                frame
+                for _, frame in extract_frames(
+                    synthetic_reference, target_fps=1.0, max_frames=3
+                )
+            ]
+        )
+
+        batch = compute_hashes_batch(frames, CompareType.PHASH, hash_size=8)
+
+        for packed, frame in zip(batch, frames):
+            single = compute_hash(frame, CompareType.PHASH, hash_size=8)
+            assert np.array_equal(packed, np.packbits(single.hash.flatten()))
+
     def test_compute_video_signatures(self, synthetic_reference: Path) -> None:
-        """Test compute_video_signatures returns list of tuples."""
+        """Test compute_video_signatures returns a SignatureBundle of arrays."""
         hashes = compute_video_signatures(
             synthetic_reference,
             fps=2.0,
@@ -150,10 +364,151 @@ class TestHashing:
             max_frames=5,
         )
 
+        assert isinstance(hashes, SignatureBundle)
         assert len(hashes) == 5
-        for timestamp, hash_val in hashes:
-            assert isinstance(timestamp, float)
-            assert hash_val is not None
+        assert hashes.timestamps.shape == (5,)
+        assert hashes.timestamps.dtype == np.float64
+        assert hashes.signatures.shape == (5, 8)
+        assert hashes.signatures.dtype == np.uint8
+
+    def test_whash_signatures_use_downscaled_frames(
+        self, synthetic_reference: Path
+    ) -> None:
+        """Wavelet hashes should be computed on frames scaled to whash's size."""
+        sigs = compute_video_signatures(
+            synthetic_reference,
+            fps=1.0,
+            compare_type=CompareType.WHASH,
+            hash_size=8,
+            max_frames=4,
+            quiet=True,
+        )
+
+        # 160x90 source: whash works on a 64x64 image
+        frames = extract_frames(
+            synthetic_reference,
+            target_fps=1.0,
+            max_frames=4,
+            out_width=64,
+            out_height=64,
+            interpolation="LANCZOS",
+        )
+        for packed, (_, frame) in zip(sigs.signatures, frames):
+            expected = imagehash.whash(Image.fromarray(frame), hash_size=8)
+            assert np.array_equal(packed, np.packbits(expected.hash.flatten()))
+
+    def test_whash_signatures_skip_worker_pool(
+        self, synthetic_reference: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Wavelet hashes are computed inline, so no hashing threads are started."""
+
+        def no_pool(*args: object, **kwargs: object) -> None:
+            raise AssertionError("ThreadPoolExecutor created for whash")
+
+        monkeypatch.setattr(hashing, "ThreadPoolExecutor", no_pool)
+
+        sigs = compute_video_signatures(
+            synthetic_reference,
+            fps=1.0,
+            compare_type=CompareType.WHASH,
+            hash_size=8,
+            max_frames=2,
+            quiet=True,
+        )
+
+        assert len(sigs) == 2
+
+    def test_compute_video_signatures_empty(self, synthetic_reference: Path) -> None:
+        """Test an empty range still yields correctly shaped arrays."""
+        sigs = compute_video_signatures(
+            synthetic_reference,
+            fps=2.0,
+            compare_type=CompareType.SAD,
+            start_time=100.0,
+            quiet=True,
+        )
+
+        assert len(sigs) == 0
+        assert sigs.signatures.shape == (0, 64 * 64)
+
+    @pytest.mark.parametrize(
+        "hash_type", [CompareType.PHASH, CompareType.DHASH, CompareType.AHASH]
+    )
+    def test_batch_hashes_empty(self, hash_type: CompareType) -> None:
+        """Test an empty batch yields a correctly shaped array."""
+        width, height = hash_input_size(hash_type, 16)
+
+        batch = compute_hashes_batch(
+            np.empty((0, height, width), dtype=np.uint8), hash_type, hash_size=16
+        )
+
+        assert batch.shape == (0, 16 * 16 // 8)
+        assert batch.dtype == np.uint8
+
+    def test_compute_video_signatures_keeps_frame_order(
+        self, synthetic_reference: Path
+    ) -> None:
+        """Test signatures hashed in worker batches come back in frame order."""
+        sigs = compute_video_signatures(
+            synthetic_reference,
+            fps=25.0,
+            compare_type=CompareType.DHASH,
+            hash_size=8,
+            quiet=True,
+        )
+        frames = np.stack(
+            [
+                frame
+                for _, frame in extract_frames(
+                    synthetic_reference, 25.0, out_width=9, out_height=8
+                )
+            ]
+        )
+
+        assert len(sigs) > HASH_BATCH_SIZE
+        assert np.all(np.diff(sigs.timestamps) > 0)
+        expected = compute_hashes_batch(frames, CompareType.DHASH, hash_size=8)
+        assert np.array_equal(sigs.signatures, expected)
+
+    def test_multires_matches_separate_decodes(self, bbb_reference: Path) -> None:
+        """Subsampled and sliced signatures should equal directly computed ones."""
+        native_fps = get_video_info(bbb_reference).fps
+        multires = compute_video_signatures_multires(
+            bbb_reference,
+            [5.0, native_fps],
+            CompareType.DHASH,
+            hash_size=8,
+            start_time=3.0,
+            max_duration=4.0,
+            quiet=True,
+        )
+
+        expected = compute_video_signatures(
+            bbb_reference,
+            fps=5.0,
+            compare_type=CompareType.DHASH,
+            hash_size=8,
+            start_time=3.0,
+            max_duration=4.0,
+            quiet=True,
+        )
+        assert np.array_equal(multires[5.0].timestamps, expected.timestamps)
+        assert np.array_equal(multires[5.0].signatures, expected.signatures)
+        assert multires[5.0].fps == expected.fps == 5.0
+
+        sliced = slice_signatures(multires[native_fps], 4.5, 1.5)
+        expected = compute_video_signatures(
+            bbb_reference,
+            fps=native_fps,
+            compare_type=CompareType.DHASH,
+            hash_size=8,
+            start_time=4.5,
+            max_duration=1.5,
+            quiet=True,
+        )
+        assert np.array_equal(sliced.timestamps, expected.timestamps)
+        assert np.array_equal(sliced.signatures, expected.signatures)
+        assert sliced.fps == expected.fps == native_fps
 
 
 class TestHashSimilarity:
@@ -165,7 +520,7 @@ class TestHashSimilarity:
             bbb_reference,
             fps=30.0,  # High fps = consecutive frames are similar
             compare_type=CompareType.PHASH,
-            hash_size=16,
+            hash_size=8,
             start_time=5.0,  # Skip title screen fade-in
             max_frames=10,
         )
@@ -173,12 +528,218 @@ class TestHashSimilarity:
         # Check distance between adjacent frames
         distances = []
         for i in range(len(hashes) - 1):
-            _, hash1 = hashes[i]
-            _, hash2 = hashes[i + 1]
-            distances.append(hash1 - hash2)
+            hash1 = hashes.signatures[i]
+            hash2 = hashes.signatures[i + 1]
+            distances.append(hamming_distance(hash1, hash2))
 
         # Average distance should be low for adjacent frames
         avg_distance = sum(distances) / len(distances)
-        assert avg_distance < 50, (
+        # 64-bit hashes: a quarter of the 256-bit threshold
+        assert avg_distance < 12.5, (
             f"Average adjacent frame distance {avg_distance} too high"
         )
+
+    def test_hamming_distances_match_pairwise(self, bbb_reference: Path) -> None:
+        """Row-wise distances should equal hamming_distance for every pair."""
+        hashes = compute_video_signatures(
+            bbb_reference,
+            fps=30.0,
+            compare_type=CompareType.PHASH,
+            hash_size=16,
+            start_time=5.0,
+            max_frames=10,
+            quiet=True,
+        ).signatures
+
+        adjacent = hamming_distances(hashes[1:], hashes[:-1])
+        to_first = hamming_distances(hashes, hashes[0])
+
+        assert adjacent.tolist() == [
+            hamming_distance(a, b) for a, b in zip(hashes[1:], hashes[:-1])
+        ]
+        assert to_first.tolist() == [hamming_distance(h, hashes[0]) for h in hashes]
+
+    def test_hamming_distances_match_imagehash(self, bbb_reference: Path) -> None:
+        """Row-wise distances should equal imagehash's Hamming distance."""
+        frames = [
+            frame
+            for _, frame in extract_frames(
+                bbb_reference, target_fps=5.0, start_time=5.0, max_frames=10
+            )
+        ]
+        expected_hashes = [
+            imagehash.phash(Image.fromarray(frame), hash_size=16) for frame in frames
+        ]
+        packed = np.stack([np.packbits(h.hash.flatten()) for h in expected_hashes])
+
+        distances = hamming_distances(packed[1:], packed[:-1])
+
+        assert distances.tolist() == [
+            a - b for a, b in zip(expected_hashes[1:], expected_hashes[:-1])
+        ]
+
+    @pytest.mark.parametrize("hash_size", [5, 8, 16])
+    def test_hamming_distances_without_bitwise_count(
+        self,
+        popcount_fallback: ModuleType,
+        hash_size: int,
+    ) -> None:
+        """The NumPy < 2.0 fallback should count bits like a plain bit comparison."""
+        rng = np.random.default_rng(0)
+        bits = rng.integers(0, 2, size=(2, 50, hash_size * hash_size), dtype=np.uint8)
+        a, b = np.packbits(bits[0], axis=1), np.packbits(bits[1], axis=1)
+
+        distances = popcount_fallback.hamming_distances(a, b)
+
+        assert distances.tolist() == (bits[0] != bits[1]).sum(axis=1).tolist()
+        assert popcount_fallback.hamming_distance(a[0], b[0]) == distances[0]
+
+    def test_direct_sweep_without_bitwise_count(
+        self, bbb_reference: Path, bbb_offset_2s: Path, popcount_fallback: ModuleType
+    ) -> None:
+        """The direct sweep should give the same result with the fallback popcount."""
+        ref = compute_video_signatures(bbb_reference, fps=5.0, quiet=True)
+        dist = compute_video_signatures(bbb_offset_2s, fps=5.0, quiet=True)
+        expected = cross_correlate_signatures(ref, dist, method="direct")
+
+        assert (
+            popcount_fallback.cross_correlate_signatures(ref, dist, method="direct")
+            == expected
+        )
+
+
+class TestCrossCorrelation:
+    """Tests for cross_correlate_signatures."""
+
+    def test_fft_matches_direct(self, bbb_reference: Path, bbb_offset_2s: Path) -> None:
+        """FFT-based and direct hash correlation should find the same alignment."""
+        ref_sigs = compute_video_signatures(
+            bbb_reference, fps=5.0, hash_size=8, quiet=True
+        )
+        dist_sigs = compute_video_signatures(
+            bbb_offset_2s, fps=5.0, hash_size=8, quiet=True
+        )
+
+        fft_offset, fft_distance = cross_correlate_signatures(
+            ref_sigs, dist_sigs, CompareType.PHASH, method="fft"
+        )
+        direct_offset, direct_distance = cross_correlate_signatures(
+            ref_sigs, dist_sigs, CompareType.PHASH, method="direct"
+        )
+
+        assert fft_offset == direct_offset
+        assert fft_distance == pytest.approx(direct_distance)
+
+    @pytest.mark.parametrize("compare_type", [CompareType.PHASH, CompareType.SAD])
+    @pytest.mark.parametrize("method", ["direct", "fft"])
+    def test_offset_bounds_limit_search(
+        self,
+        bbb_reference: Path,
+        bbb_offset_2s: Path,
+        compare_type: CompareType,
+        method: str,
+    ) -> None:
+        """Offset bounds should restrict which offsets can be returned."""
+        ref_sigs = compute_video_signatures(
+            bbb_reference, fps=5.0, compare_type=compare_type, hash_size=8, quiet=True
+        )
+        dist_sigs = compute_video_signatures(
+            bbb_offset_2s, fps=5.0, compare_type=compare_type, hash_size=8, quiet=True
+        )
+        best_offset, best_distance = cross_correlate_signatures(
+            ref_sigs, dist_sigs, compare_type, method=method
+        )
+
+        bounded_offset, bounded_distance = cross_correlate_signatures(
+            ref_sigs,
+            dist_sigs,
+            compare_type,
+            method=method,
+            min_offset=best_offset - 2,
+            max_offset=best_offset + 2,
+        )
+        assert bounded_offset == best_offset
+        assert bounded_distance == pytest.approx(best_distance)
+
+        excluded_offset, _ = cross_correlate_signatures(
+            ref_sigs,
+            dist_sigs,
+            compare_type,
+            method=method,
+            max_offset=best_offset - 3,
+        )
+        assert excluded_offset <= best_offset - 3
+
+    def test_min_overlap_excludes_short_overlaps(self) -> None:
+        """Offsets overlapping fewer than min_overlap frames should be skipped."""
+        rng = np.random.default_rng(0)
+        ref = rng.integers(0, 256, size=(10, 8), dtype=np.uint8)
+        dist = rng.integers(0, 256, size=(6, 8), dtype=np.uint8)
+        # Only the last reference frame matches, at the first distorted one
+        dist[0] = ref[-1]
+        ref_sigs = SignatureBundle(np.arange(10.0), ref)
+        dist_sigs = SignatureBundle(np.arange(6.0), dist)
+
+        assert cross_correlate_signatures(ref_sigs, dist_sigs) == (9, 0.0)
+
+        offset, _ = cross_correlate_signatures(ref_sigs, dist_sigs, min_overlap=3)
+        assert -6 + 3 <= offset <= 10 - 3
+
+    def test_ties_resolve_to_middle_of_range(self) -> None:
+        """Tied offsets with full overlap should resolve to the middle of the range."""
+        ref_sigs = SignatureBundle(np.arange(10.0), np.zeros((10, 8), np.uint8))
+        dist_sigs = SignatureBundle(np.arange(4.0), np.zeros((4, 8), np.uint8))
+
+        assert cross_correlate_signatures(ref_sigs, dist_sigs) == (3, 0.0)
+        assert cross_correlate_signatures(
+            ref_sigs, dist_sigs, min_offset=2, max_offset=6
+        ) == (4, 0.0)
+
+    def test_sad_matches_exhaustive_search(
+        self, bbb_reference: Path, bbb_offset_2s: Path
+    ) -> None:
+        """The pruned SAD search should find the exhaustive search optimum."""
+        ref_sigs = compute_video_signatures(
+            bbb_reference, fps=5.0, compare_type=CompareType.SAD, quiet=True
+        )
+        dist_sigs = compute_video_signatures(
+            bbb_offset_2s, fps=5.0, compare_type=CompareType.SAD, quiet=True
+        )
+        ref = ref_sigs.signatures.astype(np.int64)
+        dist = dist_sigs.signatures.astype(np.int64)
+
+        averages = {}
+        for offset in range(-len(dist) + 1, len(ref)):
+            ref_start, dist_start = max(0, offset), max(0, -offset)
+            n = min(len(ref) - ref_start, len(dist) - dist_start)
+            diff = ref[ref_start : ref_start + n] - dist[dist_start : dist_start + n]
+            averages[offset] = np.abs(diff).sum(axis=1).mean()
+        expected_offset = min(averages, key=averages.__getitem__)
+
+        offset, distance = cross_correlate_signatures(
+            ref_sigs, dist_sigs, CompareType.SAD
+        )
+
+        assert offset == expected_offset
+        assert distance == pytest.approx(averages[expected_offset])
+
+    def test_unknown_method_raises(self, synthetic_reference: Path) -> None:
+        """An unknown correlation method should raise ValueError."""
+        sigs = compute_video_signatures(
+            synthetic_reference, fps=1.0, hash_size=8, quiet=True
+        )
+
+        with pytest.raises(ValueError):
+            cross_correlate_signatures(sigs, sigs, CompareType.PHASH, method="nope")
+
+    def test_different_signature_widths_raise(self, synthetic_reference: Path) -> None:
+        """Signatures of different hash sizes cannot be compared."""
+        small = compute_video_signatures(
+            synthetic_reference, fps=1.0, hash_size=8, quiet=True
+        )
+        large = compute_video_signatures(
+            synthetic_reference, fps=1.0, hash_size=16, quiet=True
+        )
+
+        with pytest.raises(ValueError, match="Signature widths differ"):
+            cross_correlate_signatures(small, large, CompareType.PHASH)
@@ -1,28 +1,42 @@
 """Tests for video offset finding using real video content (Big Buck Bunny)."""
 
+import functools
 from pathlib import Path
+from typing import Any, Callable
 
 import pytest
 
-from video_offset_finder import CompareType, find_offset
+from video_offset_finder import (
+    CompareType,
+    SignatureBundle,
+    find_offset,
+    slice_signatures,
+)
 
 
+@pytest.mark.usefixtures("cached_signatures")
 class TestBBBOffsetDetection:
-    """Test offset detection with Big Buck Bunny video clips."""
+    """Test offset detection with Big Buck Bunny video clips.
+
+    The 2s clip decodes the reference in every mode, the others reuse
+    precomputed coarse reference signatures.
+    """
 
     @pytest.mark.parametrize(
-        "offset_fixture,expected_offset",
+        "offset_fixture,expected_offset,inject_ref",
         [
-            ("bbb_offset_2s", 2.0),
-            ("bbb_offset_3p5s", 3.5),
-            ("bbb_offset_5s", 5.0),
+            ("bbb_offset_2s", 2.0, False),
+            ("bbb_offset_3p5s", 3.5, True),
+            ("bbb_offset_5s", 5.0, True),
         ],
     )
     def test_coarse_search(
         self,
         bbb_reference: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
         offset_fixture: str,
         expected_offset: float,
+        inject_ref: bool,
         request: pytest.FixtureRequest,
     ) -> None:
         """Test coarse-only search finds offset within 1 second for real content."""
@@ -34,7 +48,9 @@ class TestBBBOffsetDetection:
             compare_type=CompareType.PHASH,
             coarse_fps=1.0,
             fine_fps=1.0,
+            hash_size=8,
             frame_accurate=False,
+            ref_signatures=(bbb_reference_coarse_signatures(8) if inject_ref else None),
         )
 
         assert abs(result.offset_seconds - expected_offset) < 1.0, (
@@ -42,18 +58,20 @@ class TestBBBOffsetDetection:
         )
 
     @pytest.mark.parametrize(
-        "offset_fixture,expected_offset",
+        "offset_fixture,expected_offset,inject_ref",
         [
-            ("bbb_offset_2s", 2.0),
-            ("bbb_offset_3p5s", 3.5),
-            ("bbb_offset_5s", 5.0),
+            ("bbb_offset_2s", 2.0, False),
+            ("bbb_offset_3p5s", 3.5, True),
+            ("bbb_offset_5s", 5.0, True),
         ],
     )
     def test_hierarchical_search(
         self,
         bbb_reference: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
         offset_fixture: str,
         expected_offset: float,
+        inject_ref: bool,
         request: pytest.FixtureRequest,
     ) -> None:
         """Test hierarchical search (coarse + fine) finds offset within 0.2 seconds."""
@@ -65,7 +83,9 @@ class TestBBBOffsetDetection:
             compare_type=CompareType.PHASH,
             coarse_fps=1.0,
             fine_fps=10.0,
+            hash_size=8,
             frame_accurate=False,
+            ref_signatures=(bbb_reference_coarse_signatures(8) if inject_ref else None),
         )
 
         assert abs(result.offset_seconds - expected_offset) < 0.2, (
@@ -73,17 +93,19 @@ class TestBBBOffsetDetection:
         )
 
     @pytest.mark.parametrize(
-        "offset_fixture,expected_offset",
+        "offset_fixture,expected_offset,inject_ref",
         [
-            ("bbb_offset_2s", 2.0),
-            ("bbb_offset_5s", 5.0),
+            ("bbb_offset_2s", 2.0, False),
+            ("bbb_offset_5s", 5.0, True),
         ],
     )
     def test_frame_accurate_search(
         self,
         bbb_reference: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
         offset_fixture: str,
         expected_offset: float,
+        inject_ref: bool,
         request: pytest.FixtureRequest,
     ) -> None:
         """Test frame-accurate search finds offset within 1 second for real content.
@@ -99,7 +121,11 @@ class TestBBBOffsetDetection:
             compare_type=CompareType.PHASH,
             coarse_fps=1.0,
             fine_fps=10.0,
+            hash_size=16,
             frame_accurate=True,
+            ref_signatures=(
+                bbb_reference_coarse_signatures(16) if inject_ref else None
+            ),
         )
 
         assert abs(result.offset_seconds - expected_offset) < 1.0, (
@@ -107,6 +133,7 @@ class TestBBBOffsetDetection:
         )
 
 
+@pytest.mark.usefixtures("cached_signatures")
 class TestBBBCompareTypes:
     """Test different comparison algorithms with Big Buck Bunny content."""
 
@@ -131,7 +158,58 @@ class TestBBBCompareTypes:
             f"Compare type {compare_type.value} failed: expected ~2s, got {result.offset_seconds}s"
         )
 
+    @pytest.mark.parametrize("compare_type", list(CompareType))
+    def test_all_compare_types_find_negative_offset(
+        self,
+        bbb_reference: Path,
+        bbb_offset_2s: Path,
+        compare_type: CompareType,
+    ) -> None:
+        """All compare types should detect the -2s offset when the videos are swapped.
+
+        aHash and wHash used to land on -4.0s and -2.6s here, where a short
+        overlap at the edge of the fine window outscored the true offset.
+        """
+        result = find_offset(
+            ref_path=bbb_offset_2s,
+            dist_path=bbb_reference,
+            compare_type=compare_type,
+            coarse_fps=1.0,
+            fine_fps=5.0,
+            frame_accurate=False,
+        )
+
+        assert abs(result.offset_seconds - (-2.0)) < 0.1, (
+            f"Compare type {compare_type.value} failed: expected ~-2s, got {result.offset_seconds}s"
+        )
 
+    def test_frame_accurate_ties_keep_fine_result(
+        self,
+        bbb_reference: Path,
+        bbb_offset_5s: Path,
+    ) -> None:
+        """Tied native-rate offsets should resolve to the one nearest the fine result.
+
+        With 8x8 aHash, runs of identical hashes tie the true offset with one
+        0.2s earlier, which used to win for being the smaller offset.
+        """
+        result = find_offset(
+            ref_path=bbb_reference,
+            dist_path=bbb_offset_5s,
+            compare_type=CompareType.AHASH,
+            coarse_fps=1.0,
+            fine_fps=10.0,
+            hash_size=8,
+            frame_accurate=True,
+            quiet=True,
+        )
+
+        assert abs(result.offset_seconds - 5.0) < 0.1, (
+            f"Expected ~5s, got {result.offset_seconds}s"
+        )
+
+
+@pytest.mark.usefixtures("cached_signatures")
 class TestBBBEdgeCases:
     """Test edge cases with Big Buck Bunny content."""
 
@@ -167,3 +245,97 @@ class TestBBBEdgeCases:
         assert result.confidence < 30, (
             f"Confidence too high for identical source content: {result.confidence}"
         )
+
+    def test_precomputed_reference_signatures_match(
+        self,
+        bbb_reference: Path,
+        bbb_offset_3p5s: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
+    ) -> None:
+        """Injected coarse reference signatures should give the same result."""
+        search = functools.partial(
+            find_offset,
+            ref_path=bbb_reference,
+            dist_path=bbb_offset_3p5s,
+            compare_type=CompareType.PHASH,
+            coarse_fps=1.0,
+            fine_fps=5.0,
+            max_search_offset=6.0,
+            frame_accurate=False,
+            quiet=True,
+        )
+
+        decoded = search()
+        injected = search(ref_signatures=bbb_reference_coarse_signatures(16))
+
+        assert injected == decoded
+
+    @pytest.mark.parametrize(
+        "overrides,match",
+        [
+            ({"hash_size": 8}, "values per frame"),
+            ({"compare_type": CompareType.SAD}, "values per frame"),
+            ({"coarse_fps": 2.0}, "sampled at 1.00 fps"),
+        ],
+    )
+    def test_precomputed_reference_signatures_must_match_settings(
+        self,
+        bbb_reference: Path,
+        bbb_offset_3p5s: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
+        overrides: dict[str, Any],
+        match: str,
+    ) -> None:
+        """Signatures computed with other settings should be rejected."""
+        search = functools.partial(
+            find_offset,
+            ref_path=bbb_reference,
+            dist_path=bbb_offset_3p5s,
+            compare_type=CompareType.PHASH,
+            coarse_fps=1.0,
+            fine_fps=5.0,
+            frame_accurate=False,
+            quiet=True,
+        )
+
+        with pytest.raises(ValueError, match=match):
+            search(ref_signatures=bbb_reference_coarse_signatures(16), **overrides)
+
+    def test_precomputed_reference_signatures_must_cover_start(
+        self,
+        bbb_reference: Path,
+        bbb_offset_3p5s: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
+    ) -> None:
+        """Signatures starting after start_offset should be rejected."""
+        late_start = slice_signatures(bbb_reference_coarse_signatures(16), 4.0)
+
+        with pytest.raises(ValueError, match="start at 4.00s"):
+            find_offset(
+                ref_path=bbb_reference,
+                dist_path=bbb_offset_3p5s,
+                compare_type=CompareType.PHASH,
+                start_offset=2.0,
+                quiet=True,
+                ref_signatures=late_start,
+            )
+
+    def test_precomputed_reference_signatures_without_fps(
+        self,
+        bbb_reference: Path,
+        bbb_offset_3p5s: Path,
+        bbb_reference_coarse_signatures: Callable[[int], SignatureBundle],
+    ) -> None:
+        """Without a stored rate, the timestamp spacing is checked instead."""
+        signatures = bbb_reference_coarse_signatures(16)
+        unknown_rate = SignatureBundle(signatures.timestamps, signatures.signatures)
+
+        with pytest.raises(ValueError, match="sampled at 1.00 fps"):
+            find_offset(
+                ref_path=bbb_reference,
+                dist_path=bbb_offset_3p5s,
+                compare_type=CompareType.PHASH,
+                coarse_fps=2.0,
+                quiet=True,
+                ref_signatures=unknown_rate,
+            )
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+import pytest
 
 from video_offset_finder import CompareType, find_offset
 
@@ -280,28 +281,31 @@ class TestNegativeOffset:
             f"Expected offset ~-5s, got {result.offset_seconds}s"
         )
 
+    @pytest.mark.parametrize("compare_type", [CompareType.PHASH, CompareType.SAD])
     def test_negative_offset_with_different_hash_types(
-        self, synthetic_reference: Path, synthetic_offset_5s: Path
+        self,
+        synthetic_reference: Path,
+        synthetic_offset_5s: Path,
+        compare_type: CompareType,
     ) -> None:
         """Negative offsets with fine search should work with different comparison algorithms.
 
         Note: DHASH excluded because synthetic testsrc produces identical dhash values
         for frames 6s apart, causing false matches. DHASH is tested with BBB content instead.
         """
-        for compare_type in [CompareType.PHASH, CompareType.SAD]:
-            result = find_offset(
-                ref_path=synthetic_offset_5s,
-                dist_path=synthetic_reference,
-                compare_type=compare_type,
-                coarse_fps=1.0,
-                fine_fps=5.0,
-                frame_accurate=False,
-                quiet=True,
-            )
+        result = find_offset(
+            ref_path=synthetic_offset_5s,
+            dist_path=synthetic_reference,
+            compare_type=compare_type,
+            coarse_fps=1.0,
+            fine_fps=5.0,
+            frame_accurate=False,
+            quiet=True,
+        )
 
-            assert result.offset_seconds < 0, (
-                f"{compare_type.value}: Expected negative offset, got {result.offset_seconds}s"
-            )
+        assert result.offset_seconds < 0, (
+            f"{compare_type.value}: Expected negative offset, got {result.offset_seconds}s"
+        )
 
     def test_negative_offset_2s_coarse_only(
         self, synthetic_reference: Path, synthetic_offset_2s: Path
@@ -378,31 +382,34 @@ class TestNegativeOffset:
             f"Expected offset ~-5s with frame_accurate=True, got {result.offset_seconds}s"
         )
 
+    @pytest.mark.parametrize("compare_type", [CompareType.PHASH, CompareType.SAD])
     def test_negative_offset_different_algorithms_coarse_only(
-        self, synthetic_reference: Path, synthetic_offset_5s: Path
+        self,
+        synthetic_reference: Path,
+        synthetic_offset_5s: Path,
+        compare_type: CompareType,
     ) -> None:
         """Coarse-only negative offset works with different hash types.
 
         Note: DHASH excluded because synthetic testsrc produces identical dhash values
         for frames 6s apart, causing false matches. DHASH is tested with BBB content instead.
         """
-        for compare_type in [CompareType.PHASH, CompareType.SAD]:
-            result = find_offset(
-                ref_path=synthetic_offset_5s,
-                dist_path=synthetic_reference,
-                compare_type=compare_type,
-                coarse_fps=1.0,
-                fine_fps=1.0,  # Skip fine search
-                frame_accurate=False,
-                quiet=True,
-            )
+        result = find_offset(
+            ref_path=synthetic_offset_5s,
+            dist_path=synthetic_reference,
+            compare_type=compare_type,
+            coarse_fps=1.0,
+            fine_fps=1.0,  # Skip fine search
+            frame_accurate=False,
+            quiet=True,
+        )
 
-            assert result.offset_seconds < 0, (
-                f"{compare_type.value} coarse-only: Expected negative, got {result.offset_seconds}s"
-            )
-            assert abs(result.offset_seconds - (-5.0)) < 1.0, (
-                f"{compare_type.value} coarse-only: Expected ~-5s, got {result.offset_seconds}s"
-            )
+        assert result.offset_seconds < 0, (
+            f"{compare_type.value} coarse-only: Expected negative, got {result.offset_seconds}s"
+        )
+        assert abs(result.offset_seconds - (-5.0)) < 1.0, (
+            f"{compare_type.value} coarse-only: Expected ~-5s, got {result.offset_seconds}s"
+        )
 
     def test_negative_offset_dhash_with_real_content(
         self, bbb_reference: Path, bbb_offset_5s: Path
@@ -478,6 +485,7 @@ class TestCombinedParameters:
         )
 
 
+@pytest.mark.usefixtures("cached_signatures")
 class TestEdgeCasesWithOffsetParams:
     """Test edge cases with search parameters."""
 